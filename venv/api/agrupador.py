@@ -0,0 +1,56 @@
+
+import fastapi
+from fastapi import HTTPException
+from fastapi import status
+from fastapi import Depends
+from fastapi import Request
+from fastapi import Response
+import aiomysql
+
+from typing import List
+from models.agrupador import Agrupador
+from database import get_db
+from infrastructure.cache_catalogo import responder_catalogo
+
+router = fastapi.APIRouter()
+
+
+@router.get("/api/agrupador/lista", summary="Recupera los agrupadores para asociar a los productos de un taller", tags=["Agrupadores"])
+async def agrupadores(request: Request, response: Response, db: aiomysql.Connection = Depends(get_db)):
+    return await responder_catalogo(request, response, "agrupador", "lista", lambda: agrupadores_db(db))
+
+
+# Consulta los agrupadores en la base de datos cuando no están en caché
+async def agrupadores_db(db: aiomysql.Connection):
+
+    query = " \
+        select ag.cod_agrupador as cod_agrupador, \
+            ag.nom_agrupador as nom_agrupador \
+        from agrupador ag \
+        order by ag.cod_agrupador asc"
+
+    try:
+        values = ()
+        async with db.cursor() as cursor:
+            await cursor.execute(query, values)
+            result = await cursor.fetchall()
+
+    except aiomysql.Error as e:
+        error_message = str(e)
+        if "Connection" in error_message:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error al conectar a la base de datos")
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error en la consulta a la base de datos. DBerror {error_message}")
+
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error en la base de datos")
+
+    # Armamos el diccionario de salida
+    agrupador: Agrupador = None
+    agrupadores: List[Agrupador] = []
+    for row in result:
+        agrupador = Agrupador(cod_agrupador=row[0],
+                              nom_agrupador=row[1])
+        agrupadores.append(agrupador)
+
+    return agrupadores
@@ -0,0 +1,32 @@
+import fastapi
+from fastapi.responses import PlainTextResponse
+
+from database import pool_estadisticas
+from api.perfil import cache_perfil_contexto
+from infrastructure.cache_catalogo import cache_catalogo
+from infrastructure.metricas import metricas
+
+router = fastapi.APIRouter()
+
+
+@router.get("/api/diagnostico/db/pool", response_model=dict, summary="Obtener el estado y uso del pool de conexiones a la base de datos", tags=["Diagnóstico"])
+async def diagnostico_db_pool():
+    return pool_estadisticas()
+
+
+@router.get("/api/diagnostico/cache", response_model=dict, summary="Obtener el estado de las cachés en memoria de la aplicación", tags=["Diagnóstico"])
+async def diagnostico_cache():
+    return {
+        "perfil_contexto": cache_perfil_contexto.estadisticas(),
+        "catalogo": cache_catalogo.backend.estadisticas(),
+    }
+
+
+@router.get("/api/diagnostico/db/consultas_lentas", response_model=list, summary="Obtener las consultas SQL lentas más recientes", tags=["Diagnóstico"])
+async def diagnostico_consultas_lentas():
+    return list(reversed(metricas.log_consultas_lentas))
+
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="Métricas de la aplicación en formato de texto Prometheus", tags=["Diagnóstico"])
+async def diagnostico_metricas():
+    return PlainTextResponse(metricas.texto_prometheus(pool_estadisticas()), media_type="text/plain; version=0.0.4; charset=utf-8")
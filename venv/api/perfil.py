@@ -0,0 +1,190 @@
+
+import fastapi
+from models.perfil import Perfil
+from models.perfil import PerfilContexto
+from typing import List
+from fastapi import HTTPException
+from fastapi import status
+from fastapi import Depends
+import aiomysql
+
+from database import get_db
+from infrastructure.constants import Const
+from infrastructure.cache import CacheTTL
+from infrastructure.cache import memo_solicitud
+
+router = fastapi.APIRouter()
+
+
+# Caché del contexto de usuario compartida por el proceso, indexada por id_usuario
+cache_perfil_contexto = CacheTTL(ttl=300, max_elementos=1000)
+
+
+# Invalida el contexto de un usuario luego de modificar su registro
+def perfil_contexto_invalidar(id_usuario: int):
+    cache_perfil_contexto.invalidar(id_usuario)
+    memo = memo_solicitud.get()
+    if memo is not None:
+        memo.pop(("perfil_contexto", id_usuario), None)
+
+
+# Perfil y carrera del usuario, o None si no existe. Es la búsqueda que usan los handlers para validar privilegios
+async def perfil_contexto(id_usuario: int, db: aiomysql.Connection) -> PerfilContexto:
+    # Contextos ya resueltos durante el request en curso
+    memo = memo_solicitud.get()
+    if memo is None:
+        memo = {}
+    clave_memo = ("perfil_contexto", id_usuario)
+    if clave_memo in memo:
+        return memo[clave_memo]
+
+    contexto = cache_perfil_contexto.get(id_usuario)
+    if contexto is not None:
+        memo[clave_memo] = contexto
+        return contexto
+
+    try:
+        query = " \
+            select p.cod_perfil as cod_perfil, \
+                p.nom_perfil as nom_perfil, \
+                p.descripcion as descripcion, \
+                u.cod_carrera as cod_carrera, \
+                c.nom_carrera as nom_carrera \
+            from usuario u \
+            join perfil p on u.cod_perfil = p.cod_perfil \
+            left outer join carrera c on u.cod_carrera = c.cod_carrera \
+            where u.id_usuario = %s"
+        values = (id_usuario)
+        async with db.cursor() as cursor:
+            await cursor.execute(query, values)
+            result = await cursor.fetchone()
+
+        if not result:
+            return None
+
+        contexto = PerfilContexto(id_usuario=id_usuario,
+                                  cod_perfil=result[0],
+                                  nom_perfil=result[1],
+                                  descripcion=result[2],
+                                  cod_carrera=result[3],
+                                  nom_carrera=result[4])
+        cache_perfil_contexto.set(id_usuario, contexto)
+        memo[clave_memo] = contexto
+        return contexto
+
+    except aiomysql.Error as e:
+        error_message = str(e)
+        print(error_message)
+        if "Connection" in error_message:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error al conectar a la base de datos")
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error en la consulta a la base de datos. DBerror {error_message}")
+
+    except Exception as e:
+        error_message = str(e)
+        print(error_message)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error en la base de datos. DBerror {error_message}")
+
+
+@router.get("/api/perfil/contexto/{id_usuario}", response_model=PerfilContexto, summary="Obtener el perfil y la carrera de un usuario a través de su id", tags=["Perfiles"])
+async def perfil_contexto_usuario(id_usuario: int, db: aiomysql.Connection = Depends(get_db)):
+    contexto = await perfil_contexto(id_usuario, db)
+    if contexto is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Usuario {id_usuario} no existe")
+    return contexto
+
+
+@router.get("/api/perfil/usuario/{id_usuario}", response_model=Perfil, summary="Obtener el perfil de un usuario a través de su id", tags=["Perfiles"])
+async def perfil_usuario(id_usuario: int, db: aiomysql.Connection = Depends(get_db)):
+    contexto = await perfil_contexto(id_usuario, db)
+    if not contexto:
+        return None
+
+    perfil = Perfil(cod_perfil=contexto.cod_perfil,
+                    nom_perfil=contexto.nom_perfil,
+                    descripcion=contexto.descripcion)
+    return perfil
+
+
+@router.get("/api/perfil/nom_carrera/{id_usuario}", response_model=dict, summary="Obtener el nombre de la carrera asignada al usuario respectivo", tags=["Perfiles"])
+async def perfil_nom_carrera(id_usuario: int, db: aiomysql.Connection = Depends(get_db)):
+    contexto = await perfil_contexto(id_usuario, db)
+
+    nom_carrera: str = None
+    if contexto:
+        nom_carrera = contexto.nom_carrera
+
+    return {
+        "nom_carrera": nom_carrera,
+    }
+
+
+@router.get("/api/perfil/cod_carrera/{id_usuario}", response_model=dict, summary="Obtener el código de la carrera asignada al usuario respectivo", tags=["Perfiles"])
+async def perfil_cod_carrera(id_usuario: int, db: aiomysql.Connection = Depends(get_db)):
+    contexto = await perfil_contexto(id_usuario, db)
+
+    cod_carrera: int = None
+    if contexto:
+        cod_carrera = contexto.cod_carrera
+
+    return {
+        "cod_carrera": cod_carrera,
+    }
+
+
+@router.get("/api/perfil/lista/{id_usuario}", response_model=List[Perfil], summary="Obtener la lista de perfiles desde el sistema", tags=["Perfiles"])
+async def perfil_lista(id_usuario: int, db: aiomysql.Connection = Depends(get_db)) -> List[Perfil]:
+    perfiles: List[Perfil] = []
+
+    # Determinamos el perfil del usuario para determinar qué información puede ver
+    perfil = await perfil_contexto(id_usuario, db)
+    # Si todo está correcto, Retornamos la respuesta de la API
+    if not perfil:
+        return perfiles
+    # Perfil docente no debe ver nada
+    if perfil.cod_perfil == Const.K_DOCENTE.value:
+        return perfiles
+
+    if perfil.cod_perfil == Const.K_ADMINISTRADOR_CARRERA.value:
+        query = " \
+            select p.cod_perfil as cod_perfil, \
+                p.nom_perfil as nom_perfil, \
+                p.descripcion as descripcion \
+            from perfil p \
+            where cod_perfil <> 0 \
+            order by p.cod_perfil asc"
+
+    if perfil.cod_perfil == Const.K_ADMINISTRADOR_TI.value:
+        query = " \
+            select p.cod_perfil as cod_perfil, \
+                p.nom_perfil as nom_perfil, \
+                p.descripcion as descripcion \
+            from perfil p \
+            order by p.cod_perfil asc"
+
+    try:
+        values = ()
+        async with db.cursor() as cursor:
+            await cursor.execute(query, values)
+            result = await cursor.fetchall()
+
+    except aiomysql.Error as e:
+        error_message = str(e)
+        print(error_message)
+        if "Connection" in error_message:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error al conectar a la base de datos. DBerror {error_message}.")
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error en la consulta a la base de datos. DBerror {error_message}.")
+
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error en la base de datos. {e}")
+
+    # Armamos el diccionario de salida
+    perfil: Perfil = None
+    for row in result:
+        perfil = Perfil(cod_perfil=row[0],
+                        nom_perfil=row[1],
+                        descripcion=row[2])
+        perfiles.append(perfil)
+
+    return perfiles
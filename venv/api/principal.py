@@ -0,0 +1,161 @@
+
+import asyncio
+from email.utils import formatdate
+from typing import List
+import fastapi
+from models.principal import Resumen
+from models.principal import Dashboard
+from api.perfil import perfil_contexto
+from api.param import param_ano_academ_valor
+
+from fastapi import HTTPException
+from fastapi import status
+from fastapi import Depends
+from fastapi import Response
+import aiomysql
+
+from database import get_db
+from database import conexion_db
+from infrastructure.constants import Const
+from infrastructure.dashboard import snapshot_dashboard
+from infrastructure.dashboard import CONCEPTOS_CARRERA
+
+router = fastapi.APIRouter()
+
+
+@router.get("/api/principal/{id_usuario}", summary="Obtiene los dashboards para presentar en la página principal", tags=["Principal"])
+async def principal(id_usuario: int, response: Response, db: aiomysql.Connection = Depends(get_db)):
+    nom_carrera: str = None
+    nom_ultima_carrera: str = None
+    resumen: Resumen = None
+    dashboard: Dashboard = None
+    resumenes: List[Resumen] = []
+    principal: List[Dashboard] = []
+    result = []
+
+    # Determinamos el perfil del usuario para determinar qué información puede ver
+    perfil = await perfil_contexto(id_usuario, db)
+    # Si todo está correcto, Retornamos la respuesta de la API
+    if not perfil:
+        return principal
+
+    if perfil.cod_perfil == Const.K_ADMINISTRADOR_TI.value or perfil.cod_perfil == Const.K_JEFE_BODEGA.value:
+        try:
+            filas = await snapshot_dashboard.obtiene(db)
+
+        except aiomysql.Error as e:
+            error_message = str(e)
+            print(error_message)
+            if "Connection" in error_message:
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error al conectar a la base de datos. DBerror {error_message}.")
+            else:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error en la consulta a la base de datos. DBerror {error_message}.")
+
+        except Exception as e:
+            error_message = str(e)
+            print(error_message)
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error en la base de datos. {error_message}")
+
+        result = [(fila[1], fila[2], fila[3]) for fila in filas]
+        principal_antiguedad(response)
+
+    if perfil.cod_perfil == Const.K_ADMINISTRADOR_CARRERA.value:
+        try:
+            filas = await snapshot_dashboard.obtiene(db)
+
+        except aiomysql.Error as e:
+            error_message = str(e)
+            print(error_message)
+            if "Connection" in error_message:
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error al conectar a la base de datos. DBerror {error_message}.")
+            else:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error en la consulta a la base de datos. DBerror {error_message}.")
+
+        except Exception as e:
+            error_message = str(e)
+            print(error_message)
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error en la base de datos. {error_message}")
+
+        # Se informan todos los conceptos de la carrera del usuario, con valor cero si no tiene registros
+        valores = {fila[2]: fila[3] for fila in filas if fila[0] == perfil.cod_carrera}
+        result = [(perfil.nom_carrera, concepto, valores.get(concepto, 0)) for concepto in CONCEPTOS_CARRERA]
+        principal_antiguedad(response)
+
+    if perfil.cod_perfil == Const.K_DOCENTE.value:
+        # Determinamos el año académico vigente
+        dicc = await param_ano_academ_valor(db)
+        ano_academ = dicc["ano_academ"]
+
+        query_asignados = " \
+            select count(*) as valor \
+            from prog_taller pt \
+            where pt.id_usuario = %s and \
+                pt.ano_academ = %s"
+
+        query_registrados = " \
+            select count(*) as valor \
+            from regis_taller rt \
+            where rt.id_usuario = %s and \
+                rt.ano_academ = %s"
+
+        try:
+            values = (id_usuario, ano_academ)
+            # Ambos conteos son independientes: el segundo usa otra conexión del pool para ejecutarse en paralelo
+            asignados, registrados = await asyncio.gather(principal_conteo(db, query_asignados, values),
+                                                          principal_conteo(None, query_registrados, values))
+
+        except aiomysql.Error as e:
+            error_message = str(e)
+            print(error_message)
+            if "Connection" in error_message:
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error al conectar a la base de datos. DBerror {error_message}.")
+            else:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error en la consulta a la base de datos. DBerror {error_message}.")
+
+        except Exception as e:
+            error_message = str(e)
+            print(error_message)
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error en la base de datos. {error_message}")
+
+        result = [(perfil.nom_carrera, "Cantidad de talleres asignados", asignados),
+                  (perfil.nom_carrera, "Cantidad de talleres registrados", registrados)]
+
+    # Armamos la colección de salida
+    for row in result:
+        nom_carrera = row[0]
+
+        if nom_carrera != nom_ultima_carrera:
+            resumen = {"concepto": row[1],
+                       "valor": row[2]}
+            resumenes = []
+            resumenes.append(resumen)
+            dashboard = Dashboard(nom_carrera, resumenes)
+            principal.append(dashboard)
+        else:
+            resumen = {"concepto": row[1],
+                       "valor": row[2]}
+            resumenes.append(resumen)
+
+        nom_ultima_carrera = nom_carrera
+
+    return principal
+
+
+# Ejecuta un conteo en la conexión indicada o, si no se indica, en una conexión adicional del pool
+async def principal_conteo(db: aiomysql.Connection, query: str, values: tuple) -> int:
+    if db is None:
+        async with conexion_db() as db_adicional:
+            return await principal_conteo(db_adicional, query, values)
+
+    async with db.cursor() as cursor:
+        await cursor.execute(query, values)
+        result = await cursor.fetchone()
+    return result[0]
+
+
+# Informa en la respuesta la antigüedad del snapshot con que se construyó el dashboard
+def principal_antiguedad(response: Response):
+    antiguedad = snapshot_dashboard.antiguedad()
+    if antiguedad is not None:
+        response.headers["X-Antiguedad-Dashboard"] = f"{antiguedad:.1f}"
+        response.headers["X-Dashboard-Generado"] = formatdate(snapshot_dashboard.generado, usegmt=True)
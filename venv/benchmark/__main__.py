@@ -0,0 +1,275 @@
+# Benchmark de la API contra una base de datos admtaller_bd sintética.
+#
+# Uso (desde el directorio de la aplicación):
+#   python -m benchmark contenedor [--detener]               levanta (o detiene) un contenedor MariaDB local con Docker
+#   python -m benchmark sembrar [--reiniciar] [escala]       crea el esquema de reemplazo y siembra datos sintéticos
+#   python -m benchmark indices [--aplicar | --eliminar]     muestra, crea o elimina los índices recomendados
+#   python -m benchmark ejecutar [--comparar-indices] [...]  ejecuta la carga y escribe los resultados en JSON
+#
+# Sin --url la aplicación se ejecuta en el mismo proceso (httpx.ASGITransport) con el pool apuntando a la base de
+# datos indicada; con --url la carga se envía a un servidor ya levantado (por ejemplo, uvicorn main:api).
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import aiomysql
+import httpx
+
+import database
+from benchmark.carga import ESCENARIOS_ESCRITURA
+from benchmark.carga import PESOS_ESCENARIOS
+from benchmark.carga import compara_fases
+from benchmark.carga import datos_carga
+from benchmark.carga import ejecuta_carga
+from benchmark.datos import Escala
+from benchmark.datos import siembra
+from benchmark.esquema import TABLAS
+from benchmark.esquema import crea_esquema
+from benchmark.esquema import esquema_con_datos
+from benchmark.esquema import vacia_esquema
+from benchmark.indices import aplica_indices
+from benchmark.indices import elimina_indices
+from benchmark.indices import recomienda_indices
+
+
+async def conecta(args) -> aiomysql.Connection:
+    return await aiomysql.connect(host=args.host, port=args.puerto, user=args.usuario, password=args.password, db=args.bd, autocommit=True)
+
+
+async def conteo_tablas(db: aiomysql.Connection) -> dict:
+    conteo = {}
+    async with db.cursor() as cursor:
+        for tabla in TABLAS:
+            await cursor.execute("select count(*) from information_schema.tables where table_schema = database() and table_name = %s", (tabla,))
+            if (await cursor.fetchone())[0]:
+                await cursor.execute(f"select count(*) from {tabla}")
+                conteo[tabla] = (await cursor.fetchone())[0]
+    return conteo
+
+
+def commit_actual() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def contenedor(args) -> int:
+    if args.detener:
+        subprocess.run(["docker", "stop", args.nombre], check=False)
+        return 0
+
+    subprocess.run(["docker", "run", "-d", "--rm", "--name", args.nombre,
+                    "-e", f"MARIADB_ROOT_PASSWORD={args.password}",
+                    "-e", f"MARIADB_DATABASE={args.bd}",
+                    "-p", f"{args.puerto}:3306",
+                    args.imagen], check=True)
+
+    # Espera a que el servidor acepte conexiones
+    limite = time.monotonic() + 120
+    while time.monotonic() < limite:
+        try:
+            db = await conecta(args)
+            db.close()
+            print(f"Base de datos disponible en {args.host}:{args.puerto}/{args.bd}")
+            return 0
+        except (aiomysql.Error, OSError):
+            await asyncio.sleep(1)
+
+    print("El contenedor no aceptó conexiones a tiempo")
+    return 1
+
+
+async def sembrar(args) -> int:
+    db = await conecta(args)
+    try:
+        if await esquema_con_datos(db):
+            if not args.reiniciar:
+                print("La base de datos ya tiene datos; use --reiniciar para vaciarla y sembrarla de nuevo")
+                return 1
+            await vacia_esquema(db)
+
+        escala = Escala(carreras=args.carreras,
+                        asignaturas_por_carrera=args.asignaturas_por_carrera,
+                        talleres_por_asignatura=args.talleres_por_asignatura,
+                        secciones_por_asignatura=args.secciones_por_asignatura,
+                        productos=args.productos,
+                        productos_por_taller=args.productos_por_taller,
+                        docentes_por_carrera=args.docentes_por_carrera,
+                        anos=args.anos,
+                        proporcion_registrada=args.proporcion_registrada,
+                        semilla=args.semilla)
+
+        await crea_esquema(db)
+        inicio = time.perf_counter()
+        conteo = await siembra(db, escala)
+        print(json.dumps({"escala": escala.como_dict(), "filas": conteo, "duracion_s": round(time.perf_counter() - inicio, 2)}, indent=2))
+        return 0
+
+    finally:
+        db.close()
+
+
+async def indices(args) -> int:
+    db = await conecta(args)
+    try:
+        if args.eliminar:
+            for nombre in await elimina_indices(db):
+                print(f"Eliminado {nombre}")
+            return 0
+
+        recomendacion = await recomienda_indices(db)
+        for elemento in recomendacion["cubiertos"]:
+            print(f"-- {elemento['tabla']}({', '.join(elemento['columnas'])}) ya cubierto por ({', '.join(elemento['cubierto_por'])})")
+        for elemento in recomendacion["recomendados"]:
+            print(f"-- {elemento['uso']}")
+            print(f"{elemento['ddl']};")
+
+        if args.aplicar:
+            await aplica_indices(db, recomendacion["recomendados"])
+            print(f"Índices creados: {len(recomendacion['recomendados'])}")
+        return 0
+
+    finally:
+        db.close()
+
+
+async def ejecutar(args) -> int:
+    escenarios = args.escenarios.split(",") if args.escenarios else list(PESOS_ESCENARIOS)
+    desconocidos = [escenario for escenario in escenarios if escenario not in PESOS_ESCENARIOS]
+    if desconocidos:
+        print(f"Escenarios desconocidos: {', '.join(desconocidos)}. Disponibles: {', '.join(PESOS_ESCENARIOS)}")
+        return 1
+
+    # Las fases sin y con índices deben medirse sobre los mismos datos, por lo que no se incluyen escenarios de escritura
+    excluidos = []
+    if args.comparar_indices:
+        excluidos = [escenario for escenario in escenarios if escenario in ESCENARIOS_ESCRITURA]
+        escenarios = [escenario for escenario in escenarios if escenario not in ESCENARIOS_ESCRITURA]
+        if not escenarios:
+            print(f"--comparar-indices requiere al menos un escenario de lectura; {', '.join(excluidos)} modifica los datos")
+            return 1
+        if excluidos:
+            print(f"Escenarios de escritura excluidos de la comparación: {', '.join(excluidos)}", file=sys.stderr)
+
+    db = await conecta(args)
+    app = None
+    try:
+        if args.url:
+            cliente = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        else:
+            # La aplicación en el mismo proceso, con su pool apuntando a la base de datos del benchmark
+            import main
+            app = main
+            database.DB_HOST = args.host
+            database.DB_PORT = args.puerto
+            database.DB_USER = args.usuario
+            database.DB_PASSWORD = args.password
+            database.DB_NAME = args.bd
+            await main.configura()
+            cliente = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.api), base_url="http://benchmark", timeout=args.timeout)
+
+        async with cliente:
+            datos = await datos_carga(db)
+
+            async def fase() -> dict:
+                if args.calentamiento:
+                    await ejecuta_carga(cliente, db, datos, args.calentamiento, args.concurrencia, escenarios, args.semilla + 1)
+                return await ejecuta_carga(cliente, db, datos, args.solicitudes, args.concurrencia, escenarios, args.semilla)
+
+            resultados = {
+                "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+                "commit": commit_actual(),
+                "python": platform.python_version(),
+                "modo": args.url or "en_proceso",
+                "configuracion": {
+                    "solicitudes": args.solicitudes,
+                    "concurrencia": args.concurrencia,
+                    "calentamiento": args.calentamiento,
+                    "escenarios": escenarios,
+                    "escenarios_excluidos": excluidos,
+                    "semilla": args.semilla,
+                    "pool_maxsize": database.DB_POOL_MAXSIZE,
+                },
+                "filas": await conteo_tablas(db),
+                "fases": {},
+            }
+
+            if not args.comparar_indices:
+                resultados["fases"]["actual"] = await fase()
+            else:
+                recomendacion = await recomienda_indices(db)
+                resultados["indices"] = recomendacion
+                resultados["fases"]["sin_indices"] = await fase()
+                await aplica_indices(db, recomendacion["recomendados"])
+                resultados["fases"]["con_indices"] = await fase()
+                resultados["comparacion"] = compara_fases(resultados["fases"]["sin_indices"], resultados["fases"]["con_indices"])
+
+    finally:
+        if app is not None:
+            await app.close_db_connection()
+        db.close()
+
+    texto = json.dumps(resultados, indent=2, default=str)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto)
+        print(f"Resultados escritos en {args.salida}")
+    else:
+        print(texto)
+
+    for nombre, resultado in resultados["fases"].items():
+        print(f"[{nombre}] {resultado['solicitudes']} solicitudes en {resultado['duracion_s']}s, {resultado['throughput_rps']} rps, "
+              f"p50 {resultado['p50_ms']} ms, p95 {resultado['p95_ms']} ms, p99 {resultado['p99_ms']} ms, "
+              f"pool en uso máx {resultado['conexiones']['pool_en_uso_max']}, errores {resultado['errores']}", file=sys.stderr)
+    return 0
+
+
+def argumentos(argv: list):
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Benchmark de la API de administración de talleres")
+    parser.add_argument("--host", default=database.DB_HOST)
+    parser.add_argument("--puerto", type=int, default=database.DB_PORT)
+    parser.add_argument("--usuario", default=database.DB_USER)
+    parser.add_argument("--password", default=database.DB_PASSWORD)
+    parser.add_argument("--bd", default=database.DB_NAME)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p = comandos.add_parser("contenedor", help="Levanta o detiene un contenedor MariaDB local")
+    p.add_argument("--imagen", default="mariadb:10.11")
+    p.add_argument("--nombre", default="admtaller-benchmark")
+    p.add_argument("--detener", action="store_true")
+
+    p = comandos.add_parser("sembrar", help="Crea el esquema y siembra datos sintéticos")
+    escala = Escala()
+    for nombre, valor in escala.como_dict().items():
+        if nombre != "ano_vigente":
+            p.add_argument(f"--{nombre.replace('_', '-')}", type=type(valor), default=valor)
+    p.add_argument("--reiniciar", action="store_true", help="Vacía las tablas antes de sembrar")
+
+    p = comandos.add_parser("indices", help="Muestra, crea o elimina los índices recomendados")
+    p.add_argument("--aplicar", action="store_true")
+    p.add_argument("--eliminar", action="store_true")
+
+    p = comandos.add_parser("ejecutar", help="Ejecuta la carga concurrente sobre las rutas principales")
+    p.add_argument("--url", help="URL de un servidor ya levantado; por omisión la aplicación se ejecuta en el mismo proceso")
+    p.add_argument("--solicitudes", type=int, default=2000)
+    p.add_argument("--concurrencia", type=int, default=20)
+    p.add_argument("--calentamiento", type=int, default=100, help="Solicitudes previas no medidas, para poblar cachés y el pool")
+    p.add_argument("--escenarios", help=f"Lista separada por comas. Disponibles: {', '.join(PESOS_ESCENARIOS)}")
+    p.add_argument("--semilla", type=int, default=1)
+    p.add_argument("--timeout", type=float, default=60.0)
+    p.add_argument("--comparar-indices", action="store_true", help="Mide sin y con los índices recomendados y compara (sólo escenarios de lectura)")
+    p.add_argument("--salida", help="Archivo JSON de resultados")
+
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = argumentos(sys.argv[1:])
+    comandos = {"contenedor": contenedor, "sembrar": sembrar, "indices": indices, "ejecutar": ejecutar}
+    sys.exit(asyncio.run(comandos[args.comando](args)))
@@ -0,0 +1,233 @@
+import asyncio
+import datetime
+import math
+import random
+import time
+import uuid
+
+import aiomysql
+import httpx
+
+from infrastructure.constants import Const
+
+
+# Peso relativo de cada escenario en la mezcla de solicitudes
+PESOS_ESCENARIOS = {
+    "principal": 30,
+    "taller_producto_lista": 25,
+    "consulta_1": 5,
+    "consulta_2": 5,
+    "consulta_3": 5,
+    "consulta_4": 5,
+    "consulta_5": 5,
+    "registro_taller": 20,
+}
+
+# Escenarios que modifican la base de datos (registro_taller consume talleres pendientes e inserta en regis_taller y
+# det_regis_taller). Se excluyen al comparar fases, para que ambas se midan sobre los mismos datos
+ESCENARIOS_ESCRITURA = ("registro_taller",)
+
+# Segundos entre muestras del uso de conexiones durante la carga
+INTERVALO_MUESTREO: float = 0.2
+
+# Talleres programados sin registrar que se reservan para el escenario registro_taller
+MAX_PENDIENTES_REGISTRO: int = 20000
+
+
+# Datos de la base de datos con los que se arman las solicitudes
+async def datos_carga(db: aiomysql.Connection) -> dict:
+    async with db.cursor() as cursor:
+        await cursor.execute("select p.valor from param p where p.cod_param = 1")
+        ano_academ = int((await cursor.fetchone())[0])
+
+        await cursor.execute("select u.id_usuario, u.cod_perfil from usuario u")
+        usuarios = {}
+        for id_usuario, cod_perfil in await cursor.fetchall():
+            usuarios.setdefault(cod_perfil, []).append(id_usuario)
+
+        await cursor.execute("select t.id_taller from taller t")
+        talleres = [row[0] for row in await cursor.fetchall()]
+
+        await cursor.execute("select min(pt.fecha), max(pt.fecha) from prog_taller pt where pt.ano_academ = %s", (ano_academ,))
+        fecha_minima, fecha_maxima = await cursor.fetchone()
+
+        await cursor.execute(" \
+            select pt.fecha, \
+                pt.ano_academ, \
+                pt.cod_periodo_academ, \
+                pt.sigla, \
+                pt.seccion, \
+                pt.id_taller, \
+                pt.id_usuario \
+            from prog_taller pt \
+            left outer join regis_taller rt on pt.fecha = rt.fecha and pt.ano_academ = rt.ano_academ and pt.cod_periodo_academ = rt.cod_periodo_academ and \
+                pt.sigla = rt.sigla and pt.seccion = rt.seccion and pt.id_taller = rt.id_taller \
+            where rt.id_taller is null \
+            limit %s", (MAX_PENDIENTES_REGISTRO,))
+        pendientes = list(await cursor.fetchall())
+
+    administradores = usuarios.get(Const.K_ADMINISTRADOR_TI.value, []) + usuarios.get(Const.K_ADMINISTRADOR_CARRERA.value, []) + \
+        usuarios.get(Const.K_JEFE_BODEGA.value, [])
+
+    return {
+        "ano_academ": ano_academ,
+        "usuarios": [id_usuario for lista in usuarios.values() for id_usuario in lista],
+        "administradores": administradores,
+        "talleres": talleres,
+        "fecha_minima": fecha_minima,
+        "fecha_maxima": fecha_maxima,
+        "pendientes": pendientes,
+    }
+
+
+# Arma la solicitud (método, url, argumentos de httpx) de un escenario, o None si ya no hay datos para armarla
+def solicitud(escenario: str, datos: dict, azar: random.Random):
+    ano_academ = datos["ano_academ"]
+    administrador = azar.choice(datos["administradores"])
+
+    if escenario == "principal":
+        return "GET", f"/api/principal/{azar.choice(datos['usuarios'])}", {}
+    if escenario == "taller_producto_lista":
+        return "GET", f"/api/taller/{azar.choice(datos['talleres'])}/producto/lista", {}
+    if escenario == "consulta_1":
+        return "GET", f"/api/consulta/1/{administrador}", {}
+    if escenario in ("consulta_2", "consulta_3"):
+        return "GET", f"/api/consulta/{escenario[-1]}/ano_academ/{ano_academ}/{administrador}", {}
+    if escenario in ("consulta_4", "consulta_5"):
+        # Un mes del año vigente, como las consultas de bodega por rango de fechas
+        if datos["fecha_minima"] is None:
+            return None
+        dias = max((datos["fecha_maxima"] - datos["fecha_minima"]).days - 30, 0)
+        fecha_inicio = datos["fecha_minima"] + datetime.timedelta(days=azar.randint(0, dias))
+        fecha_termino = fecha_inicio + datetime.timedelta(days=30)
+        return "GET", f"/api/consulta/{escenario[-1]}/ano_academ/{ano_academ}/fecha_inicio/{fecha_inicio}/fecha_termino/{fecha_termino}/{administrador}", {}
+    if escenario == "registro_taller":
+        if not datos["pendientes"]:
+            return None
+        fecha, ano, cod_periodo_academ, sigla, seccion, id_taller, id_usuario = datos["pendientes"].pop()
+        registro = {
+            "fecha": str(fecha),
+            "ano_academ": ano,
+            "cod_periodo_academ": cod_periodo_academ,
+            "sigla": sigla,
+            "seccion": seccion,
+            "id_taller": id_taller,
+            "id_usuario": id_usuario,
+            "obs": "Registro de benchmark",
+        }
+        return "POST", "/api/registro/taller", {"json": registro, "headers": {"Idempotency-Key": str(uuid.uuid4())}}
+
+    raise ValueError(f"Escenario desconocido: {escenario}")
+
+
+def percentil(valores: list, p: float) -> float:
+    if not valores:
+        return None
+    return valores[max(math.ceil(p / 100 * len(valores)) - 1, 0)]
+
+
+# Muestrea el uso de conexiones del pool de la aplicación y las conexiones abiertas en el servidor
+async def _muestrea_conexiones(cliente: httpx.AsyncClient, db: aiomysql.Connection, conexiones: dict, termina: asyncio.Event):
+    while not termina.is_set():
+        try:
+            pool = (await cliente.get("/api/diagnostico/db/pool")).json()
+            conexiones["pool_en_uso_max"] = max(conexiones["pool_en_uso_max"], pool["en_uso"])
+            conexiones["pool_size_max"] = max(conexiones["pool_size_max"], pool["size"])
+        except (httpx.HTTPError, ValueError, KeyError):
+            pass
+
+        async with db.cursor() as cursor:
+            await cursor.execute("show global status like 'Threads_connected'")
+            conexiones["servidor_conectadas_max"] = max(conexiones["servidor_conectadas_max"], int((await cursor.fetchone())[1]))
+
+        try:
+            await asyncio.wait_for(termina.wait(), timeout=INTERVALO_MUESTREO)
+        except asyncio.TimeoutError:
+            pass
+
+
+# Ejecuta las solicitudes con la concurrencia indicada y retorna latencias por escenario, throughput y conexiones usadas
+async def ejecuta_carga(cliente: httpx.AsyncClient, db: aiomysql.Connection, datos: dict, solicitudes: int, concurrencia: int,
+                        escenarios: list, semilla: int) -> dict:
+    azar = random.Random(semilla)
+    pesos = [PESOS_ESCENARIOS[escenario] for escenario in escenarios]
+    plan = iter(azar.choices(escenarios, weights=pesos, k=solicitudes))
+
+    latencias = {escenario: [] for escenario in escenarios}
+    estados = {escenario: {} for escenario in escenarios}
+    omitidas = {escenario: 0 for escenario in escenarios}
+    conexiones = {"pool_en_uso_max": 0, "pool_size_max": 0, "servidor_conectadas_max": 0}
+
+    async def trabajador():
+        for escenario in plan:
+            peticion = solicitud(escenario, datos, azar)
+            if peticion is None:
+                omitidas[escenario] += 1
+                continue
+
+            metodo, url, argumentos = peticion
+            inicio = time.perf_counter()
+            try:
+                respuesta = await cliente.request(metodo, url, **argumentos)
+                await respuesta.aread()
+                estado = str(respuesta.status_code)
+            except httpx.HTTPError as e:
+                estado = type(e).__name__
+            latencias[escenario].append(time.perf_counter() - inicio)
+            estados[escenario][estado] = estados[escenario].get(estado, 0) + 1
+
+    termina = asyncio.Event()
+    muestreo = asyncio.create_task(_muestrea_conexiones(cliente, db, conexiones, termina))
+    inicio = time.perf_counter()
+    await asyncio.gather(*[trabajador() for _ in range(concurrencia)])
+    duracion = time.perf_counter() - inicio
+    termina.set()
+    await muestreo
+
+    resultado_escenarios = {}
+    for escenario in escenarios:
+        valores = sorted(latencias[escenario])
+        errores = sum(cantidad for estado, cantidad in estados[escenario].items() if not estado.startswith("2"))
+        resultado_escenarios[escenario] = {
+            "solicitudes": len(valores),
+            "omitidas": omitidas[escenario],
+            "errores": errores,
+            "estados": estados[escenario],
+            "throughput_rps": round(len(valores) / duracion, 2) if duracion else None,
+            "promedio_ms": round(sum(valores) / len(valores) * 1000, 2) if valores else None,
+            "p50_ms": round(percentil(valores, 50) * 1000, 2) if valores else None,
+            "p95_ms": round(percentil(valores, 95) * 1000, 2) if valores else None,
+            "p99_ms": round(percentil(valores, 99) * 1000, 2) if valores else None,
+            "max_ms": round(valores[-1] * 1000, 2) if valores else None,
+        }
+
+    total = sum(resultado["solicitudes"] for resultado in resultado_escenarios.values())
+    todas = sorted(valor for valores in latencias.values() for valor in valores)
+    return {
+        "duracion_s": round(duracion, 3),
+        "solicitudes": total,
+        "errores": sum(resultado["errores"] for resultado in resultado_escenarios.values()),
+        "throughput_rps": round(total / duracion, 2) if duracion else None,
+        "p50_ms": round(percentil(todas, 50) * 1000, 2) if todas else None,
+        "p95_ms": round(percentil(todas, 95) * 1000, 2) if todas else None,
+        "p99_ms": round(percentil(todas, 99) * 1000, 2) if todas else None,
+        "conexiones": conexiones,
+        "escenarios": resultado_escenarios,
+    }
+
+
+# Diferencia de latencia por escenario entre dos fases (por ejemplo, sin y con los índices recomendados)
+def compara_fases(antes: dict, despues: dict) -> dict:
+    comparacion = {}
+    for escenario, resultado in antes["escenarios"].items():
+        posterior = despues["escenarios"].get(escenario)
+        if posterior is None or not resultado["p95_ms"] or posterior["p95_ms"] is None:
+            continue
+        comparacion[escenario] = {
+            "p50_ms_antes": resultado["p50_ms"],
+            "p50_ms_despues": posterior["p50_ms"],
+            "p95_ms_antes": resultado["p95_ms"],
+            "p95_ms_despues": posterior["p95_ms"],
+            "variacion_p95_pct": round((posterior["p95_ms"] - resultado["p95_ms"]) / resultado["p95_ms"] * 100, 1),
+        }
+    return comparacion
@@ -0,0 +1,192 @@
+import datetime
+import random
+
+import aiomysql
+
+from infrastructure.constants import Const
+from infrastructure.idempotencia import asegura_idempotencia
+from infrastructure.resumen_costo import asegura_resumen_costo
+from infrastructure.resumen_costo import reconstruye_resumen_costo
+
+
+# Filas por sentencia multi-fila al sembrar
+K_FILAS_POR_INSERT: int = 1000
+
+# Semanas de clases por período académico y mes de inicio de cada período
+K_SEMANAS_PERIODO: int = 18
+MES_INICIO_PERIODO = {1: 3, 2: 8}
+
+
+# Tamaño de la base de datos sintética. Los valores por omisión generan del orden de 10^4 filas en prog_taller
+class Escala:
+
+    def __init__(self,
+                 carreras: int = 2,
+                 asignaturas_por_carrera: int = 10,
+                 talleres_por_asignatura: int = 12,
+                 secciones_por_asignatura: int = 3,
+                 productos: int = 300,
+                 productos_por_taller: int = 15,
+                 docentes_por_carrera: int = 10,
+                 anos: int = 3,
+                 proporcion_registrada: float = 0.8,
+                 ano_vigente: int = None,
+                 semilla: int = 1):
+        self.carreras = carreras
+        self.asignaturas_por_carrera = asignaturas_por_carrera
+        self.talleres_por_asignatura = talleres_por_asignatura
+        self.secciones_por_asignatura = secciones_por_asignatura
+        self.productos = productos
+        self.productos_por_taller = productos_por_taller
+        self.docentes_por_carrera = docentes_por_carrera
+        self.anos = anos
+        self.proporcion_registrada = proporcion_registrada
+        self.ano_vigente = ano_vigente or datetime.date.today().year
+        self.semilla = semilla
+
+    def como_dict(self) -> dict:
+        return dict(vars(self))
+
+
+async def _inserta(db: aiomysql.Connection, query: str, filas: list) -> int:
+    async with db.cursor() as cursor:
+        for inicio in range(0, len(filas), K_FILAS_POR_INSERT):
+            await cursor.executemany(query, filas[inicio:inicio + K_FILAS_POR_INSERT])
+    return len(filas)
+
+
+# Siembra la base de datos vacía y retorna la cantidad de filas por tabla
+async def siembra(db: aiomysql.Connection, escala: Escala) -> dict:
+    azar = random.Random(escala.semilla)
+    conteo = {}
+
+    conteo["perfil"] = await _inserta(db, "insert into perfil (cod_perfil, nom_perfil, descripcion) values (%s, %s, %s)", [
+        (Const.K_ADMINISTRADOR_TI.value, "Administrador TI", "Administra el sistema"),
+        (Const.K_ADMINISTRADOR_CARRERA.value, "Administrador de carrera", "Administra una carrera"),
+        (Const.K_DOCENTE.value, "Docente", "Ejecuta y registra talleres"),
+        (Const.K_JEFE_BODEGA.value, "Jefe de bodega", "Consulta los requerimientos de productos"),
+    ])
+    conteo["param"] = await _inserta(db, "insert into param (cod_param, nom_param, valor) values (%s, %s, %s)", [
+        (1, "Año académico vigente", str(escala.ano_vigente)),
+    ])
+    conteo["periodo_academ"] = await _inserta(db, "insert into periodo_academ (cod_periodo_academ, nom_periodo_academ, nom_periodo_academ_abrev) values (%s, %s, %s)", [
+        (1, "Primer semestre", "1S"),
+        (2, "Segundo semestre", "2S"),
+    ])
+    conteo["agrupador"] = await _inserta(db, "insert into agrupador (cod_agrupador, nom_agrupador) values (%s, %s)", [
+        (1, "Preparación"),
+        (2, "Montaje"),
+        (3, "Degustación"),
+    ])
+    conteo["unidad_medida"] = await _inserta(db, "insert into unidad_medida (cod_unidad_medida, nom_unidad_medida, nom_unidad_medida_abrev) values (%s, %s, %s)", [
+        (1, "Kilogramo", "kg"),
+        (2, "Litro", "lt"),
+        (3, "Unidad", "un"),
+    ])
+    conteo["categ_producto"] = await _inserta(db, "insert into categ_producto (cod_categ_producto, nom_categ_producto) values (%s, %s)", [
+        (indice, f"Categoría {indice}") for indice in range(1, 9)
+    ])
+
+    carreras = list(range(1, escala.carreras + 1))
+    conteo["carrera"] = await _inserta(db, "insert into carrera (cod_carrera, nom_carrera, nom_carrera_abrev) values (%s, %s, %s)", [
+        (cod_carrera, f"Carrera {cod_carrera:03d}", f"C{cod_carrera:03d}") for cod_carrera in carreras
+    ])
+
+    # Usuarios: un administrador TI, un jefe de bodega y, por carrera, un administrador y sus docentes
+    usuarios = [("admin_ti", Const.K_ADMINISTRADOR_TI.value, None),
+                ("jefe_bodega", Const.K_JEFE_BODEGA.value, None)]
+    for cod_carrera in carreras:
+        usuarios.append((f"admin_{cod_carrera}", Const.K_ADMINISTRADOR_CARRERA.value, cod_carrera))
+        for indice in range(escala.docentes_por_carrera):
+            usuarios.append((f"docente_{cod_carrera}_{indice}", Const.K_DOCENTE.value, cod_carrera))
+    conteo["usuario"] = await _inserta(db, "insert into usuario (login, hash_password, primer_apellido, segundo_apellido, nom, nom_preferido, cod_perfil, cod_carrera) \
+        values (%s, %s, %s, %s, %s, %s, %s, %s)", [
+        (login, "bench", f"Apellido {login}", "Benchmark", login, login, cod_perfil, cod_carrera) for login, cod_perfil, cod_carrera in usuarios
+    ])
+
+    async with db.cursor() as cursor:
+        await cursor.execute("select id_usuario, cod_carrera from usuario where cod_perfil = %s", (Const.K_DOCENTE.value,))
+        docentes = {}
+        for id_usuario, cod_carrera in await cursor.fetchall():
+            docentes.setdefault(cod_carrera, []).append(id_usuario)
+
+    conteo["producto"] = await _inserta(db, "insert into producto (nom_producto, precio, cod_unidad_medida, cod_categ_producto) values (%s, %s, %s, %s)", [
+        (f"Producto {indice:05d}", azar.randint(200, 20000), azar.randint(1, 3), azar.randint(1, 8)) for indice in range(escala.productos)
+    ])
+    async with db.cursor() as cursor:
+        await cursor.execute("select id_producto from producto")
+        productos = [row[0] for row in await cursor.fetchall()]
+
+    asignaturas = []
+    for cod_carrera in carreras:
+        for indice in range(escala.asignaturas_por_carrera):
+            asignaturas.append((f"C{cod_carrera:03d}A{indice:03d}", cod_carrera))
+    conteo["asign"] = await _inserta(db, "insert into asign (sigla, nom_asign, nom_asign_abrev, cod_carrera) values (%s, %s, %s, %s)", [
+        (sigla, f"Asignatura {sigla}", sigla, cod_carrera) for sigla, cod_carrera in asignaturas
+    ])
+
+    conteo["taller"] = await _inserta(db, "insert into taller (titulo_preparacion, detalle_preparacion, semana, sigla) values (%s, %s, %s, %s)", [
+        (f"Taller {semana} de {sigla}", "Preparación de benchmark", semana, sigla)
+        for sigla, cod_carrera in asignaturas for semana in range(1, escala.talleres_por_asignatura + 1)
+    ])
+    async with db.cursor() as cursor:
+        await cursor.execute("select id_taller, sigla, semana from taller")
+        talleres = {}
+        for id_taller, sigla, semana in await cursor.fetchall():
+            talleres.setdefault(sigla, []).append((id_taller, semana))
+
+    config = []
+    for lista in talleres.values():
+        for id_taller, semana in lista:
+            for id_producto in azar.sample(productos, min(escala.productos_por_taller, len(productos))):
+                config.append((id_taller, id_producto, azar.randint(1, 3), round(azar.uniform(0.1, 5.0), 2)))
+    conteo["config_taller"] = await _inserta(db, "insert into config_taller (id_taller, id_producto, cod_agrupador, cantidad) values (%s, %s, %s, %s)", config)
+
+    # Programación: cada sección de cada asignatura, un año por cada año sembrado, con un taller por semana
+    prog_asign = []
+    prog_taller = []
+    hoy = datetime.date.today()
+    for ano_academ in range(escala.ano_vigente - escala.anos + 1, escala.ano_vigente + 1):
+        for sigla, cod_carrera in asignaturas:
+            cod_periodo_academ = azar.randint(1, 2)
+            inicio = datetime.date(ano_academ, MES_INICIO_PERIODO[cod_periodo_academ], 1)
+            for seccion in range(1, escala.secciones_por_asignatura + 1):
+                prog_asign.append((ano_academ, cod_periodo_academ, sigla, seccion))
+                id_usuario = azar.choice(docentes[cod_carrera]) if docentes.get(cod_carrera) else None
+                for id_taller, semana in talleres.get(sigla, []):
+                    fecha = inicio + datetime.timedelta(weeks=(semana - 1) % K_SEMANAS_PERIODO, days=seccion - 1)
+                    prog_taller.append((fecha, ano_academ, cod_periodo_academ, sigla, seccion, id_taller, id_usuario))
+    conteo["prog_asign"] = await _inserta(db, "insert into prog_asign (ano_academ, cod_periodo_academ, sigla, seccion) values (%s, %s, %s, %s)", prog_asign)
+    conteo["prog_taller"] = await _inserta(db, "insert into prog_taller (fecha, ano_academ, cod_periodo_academ, sigla, seccion, id_taller, id_usuario) \
+        values (%s, %s, %s, %s, %s, %s, %s)", prog_taller)
+
+    # Registro: una parte de los talleres ya ejecutados; el resto queda disponible para registrar durante la carga
+    regis_taller = [fila + ("Registro de benchmark",) for fila in prog_taller if fila[0] < hoy and azar.random() < escala.proporcion_registrada]
+    conteo["regis_taller"] = await _inserta(db, "insert into regis_taller (fecha, ano_academ, cod_periodo_academ, sigla, seccion, id_taller, id_usuario, obs) \
+        values (%s, %s, %s, %s, %s, %s, %s, %s)", regis_taller)
+
+    # Detalle con los precios vigentes, con la misma forma que el registro de la aplicación
+    async with db.cursor() as cursor:
+        await cursor.execute(" \
+            insert into det_regis_taller \
+            select rt.fecha as fecha, \
+                rt.ano_academ as ano_academ, \
+                rt.cod_periodo_academ as cod_periodo_academ, \
+                rt.sigla as sigla, \
+                rt.seccion as seccion, \
+                ct.id_producto as id_producto, \
+                rt.id_taller as id_taller, \
+                ct.cod_agrupador as cod_agrupador, \
+                p.precio as precio, \
+                ct.cantidad as cantidad \
+            from regis_taller rt \
+            join config_taller ct on ct.id_taller = rt.id_taller \
+            join producto p on ct.id_producto = p.id_producto")
+        conteo["det_regis_taller"] = cursor.rowcount
+
+    # Estructuras que la aplicación crea al iniciar
+    await asegura_resumen_costo(db)
+    conteo["resumen_costo_taller"] = await reconstruye_resumen_costo(db)
+    await asegura_idempotencia(db)
+
+    return conteo
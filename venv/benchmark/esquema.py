@@ -0,0 +1,191 @@
+import aiomysql
+
+
+# Esquema de reemplazo de admtaller_bd para la base de datos de benchmark (por ejemplo, un contenedor MariaDB vacío).
+# Se deduce de las sentencias de api/*.py: claves primarias y foráneas hacia los catálogos, sin índices secundarios,
+# para poder medir el efecto de los índices recomendados por benchmark.indices
+DDL_ESQUEMA = (
+    " \
+    create table if not exists perfil ( \
+        cod_perfil int not null, \
+        nom_perfil varchar(50) not null, \
+        descripcion varchar(200) null, \
+        primary key (cod_perfil) \
+    )",
+    " \
+    create table if not exists carrera ( \
+        cod_carrera int not null, \
+        nom_carrera varchar(100) not null, \
+        nom_carrera_abrev varchar(20) null, \
+        primary key (cod_carrera) \
+    )",
+    " \
+    create table if not exists usuario ( \
+        id_usuario int not null auto_increment, \
+        login varchar(50) not null, \
+        hash_password varchar(200) null, \
+        primer_apellido varchar(50) not null, \
+        segundo_apellido varchar(50) null, \
+        nom varchar(50) not null, \
+        nom_preferido varchar(50) null, \
+        cod_perfil int not null, \
+        cod_carrera int null, \
+        primary key (id_usuario), \
+        unique key (login), \
+        foreign key (cod_perfil) references perfil (cod_perfil), \
+        foreign key (cod_carrera) references carrera (cod_carrera) \
+    )",
+    " \
+    create table if not exists param ( \
+        cod_param int not null, \
+        nom_param varchar(100) not null, \
+        valor varchar(100) null, \
+        primary key (cod_param) \
+    )",
+    " \
+    create table if not exists periodo_academ ( \
+        cod_periodo_academ int not null, \
+        nom_periodo_academ varchar(50) not null, \
+        nom_periodo_academ_abrev varchar(20) null, \
+        primary key (cod_periodo_academ) \
+    )",
+    " \
+    create table if not exists agrupador ( \
+        cod_agrupador int not null, \
+        nom_agrupador varchar(50) not null, \
+        primary key (cod_agrupador) \
+    )",
+    " \
+    create table if not exists unidad_medida ( \
+        cod_unidad_medida int not null, \
+        nom_unidad_medida varchar(50) not null, \
+        nom_unidad_medida_abrev varchar(10) null, \
+        primary key (cod_unidad_medida) \
+    )",
+    " \
+    create table if not exists categ_producto ( \
+        cod_categ_producto int not null, \
+        nom_categ_producto varchar(50) not null, \
+        primary key (cod_categ_producto) \
+    )",
+    " \
+    create table if not exists asign ( \
+        sigla varchar(20) not null, \
+        nom_asign varchar(100) not null, \
+        nom_asign_abrev varchar(30) null, \
+        cod_carrera int not null, \
+        primary key (sigla), \
+        foreign key (cod_carrera) references carrera (cod_carrera) \
+    )",
+    " \
+    create table if not exists taller ( \
+        id_taller int not null auto_increment, \
+        titulo_preparacion varchar(200) not null, \
+        detalle_preparacion text null, \
+        semana int null, \
+        sigla varchar(20) not null, \
+        primary key (id_taller), \
+        foreign key (sigla) references asign (sigla) \
+    )",
+    " \
+    create table if not exists producto ( \
+        id_producto int not null auto_increment, \
+        nom_producto varchar(100) not null, \
+        precio int not null, \
+        cod_unidad_medida int not null, \
+        cod_categ_producto int not null, \
+        primary key (id_producto), \
+        foreign key (cod_unidad_medida) references unidad_medida (cod_unidad_medida), \
+        foreign key (cod_categ_producto) references categ_producto (cod_categ_producto) \
+    )",
+    " \
+    create table if not exists config_taller ( \
+        id_taller int not null, \
+        id_producto int not null, \
+        cod_agrupador int not null, \
+        cantidad decimal(10, 2) not null, \
+        primary key (id_producto, id_taller, cod_agrupador), \
+        foreign key (id_producto) references producto (id_producto), \
+        foreign key (cod_agrupador) references agrupador (cod_agrupador) \
+    )",
+    " \
+    create table if not exists prog_asign ( \
+        ano_academ int not null, \
+        cod_periodo_academ int not null, \
+        sigla varchar(20) not null, \
+        seccion int not null, \
+        primary key (ano_academ, cod_periodo_academ, sigla, seccion), \
+        foreign key (cod_periodo_academ) references periodo_academ (cod_periodo_academ), \
+        foreign key (sigla) references asign (sigla) \
+    )",
+    " \
+    create table if not exists prog_taller ( \
+        fecha date not null, \
+        ano_academ int not null, \
+        cod_periodo_academ int not null, \
+        sigla varchar(20) not null, \
+        seccion int not null, \
+        id_taller int not null, \
+        id_usuario int null, \
+        primary key (fecha, ano_academ, cod_periodo_academ, sigla, seccion, id_taller) \
+    )",
+    " \
+    create table if not exists regis_taller ( \
+        fecha date not null, \
+        ano_academ int not null, \
+        cod_periodo_academ int not null, \
+        sigla varchar(20) not null, \
+        seccion int not null, \
+        id_taller int not null, \
+        id_usuario int null, \
+        obs varchar(500) null, \
+        primary key (fecha, ano_academ, cod_periodo_academ, sigla, seccion, id_taller) \
+    )",
+    " \
+    create table if not exists det_regis_taller ( \
+        fecha date not null, \
+        ano_academ int not null, \
+        cod_periodo_academ int not null, \
+        sigla varchar(20) not null, \
+        seccion int not null, \
+        id_producto int not null, \
+        id_taller int not null, \
+        cod_agrupador int not null, \
+        precio int not null, \
+        cantidad decimal(10, 2) not null, \
+        primary key (fecha, ano_academ, cod_periodo_academ, sigla, seccion, id_taller, id_producto, cod_agrupador) \
+    )",
+)
+
+# Tablas en orden inverso de dependencias, para vaciarlas antes de sembrar
+TABLAS = ("det_regis_taller", "regis_taller", "prog_taller", "prog_asign", "config_taller", "producto", "taller",
+          "asign", "categ_producto", "unidad_medida", "agrupador", "periodo_academ", "param", "usuario", "carrera",
+          "perfil", "resumen_costo_taller", "clave_idempotencia")
+
+
+async def crea_esquema(db: aiomysql.Connection):
+    async with db.cursor() as cursor:
+        for ddl in DDL_ESQUEMA:
+            await cursor.execute(ddl)
+
+
+# Elimina todas las filas de las tablas del esquema (y de las estructuras que crea la aplicación)
+async def vacia_esquema(db: aiomysql.Connection):
+    async with db.cursor() as cursor:
+        await cursor.execute("set foreign_key_checks = 0")
+        try:
+            for tabla in TABLAS:
+                await cursor.execute("select count(*) from information_schema.tables where table_schema = database() and table_name = %s", (tabla,))
+                if (await cursor.fetchone())[0]:
+                    await cursor.execute(f"truncate table {tabla}")
+        finally:
+            await cursor.execute("set foreign_key_checks = 1")
+
+
+async def esquema_con_datos(db: aiomysql.Connection) -> bool:
+    async with db.cursor() as cursor:
+        await cursor.execute("select count(*) from information_schema.tables where table_schema = database() and table_name = 'usuario'")
+        if not (await cursor.fetchone())[0]:
+            return False
+        await cursor.execute("select count(*) from usuario")
+        return (await cursor.fetchone())[0] > 0
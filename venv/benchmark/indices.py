@@ -0,0 +1,93 @@
+import aiomysql
+
+
+# Índices candidatos para las claves de filtro y de join de las rutas más usadas: (tabla, columnas, consultas que lo usan)
+INDICES_CANDIDATOS = (
+    ("prog_taller", ("ano_academ", "fecha"), "consultas 4 y 5: pt.ano_academ = %s and pt.fecha between %s and %s"),
+    ("prog_taller", ("id_usuario", "ano_academ"), "principal docente y consulta 3: talleres asignados por docente y año"),
+    ("regis_taller", ("id_usuario", "ano_academ"), "principal docente: talleres registrados por docente y año"),
+    ("config_taller", ("id_taller",), "consultas 4 y 5, lista de productos del taller, registro y resumen de costos: join por id_taller"),
+    ("taller", ("sigla",), "consultas 1 y 2, dashboard: join de taller con asign"),
+    ("asign", ("cod_carrera",), "dashboard y consultas por carrera: join de asign con carrera"),
+    ("usuario", ("cod_perfil", "cod_carrera"), "dashboard y consulta 3: docentes por carrera"),
+)
+
+
+def nombre_indice(tabla: str, columnas: tuple) -> str:
+    return f"idx_{tabla}_{'_'.join(columnas)}"
+
+
+# Columnas de cada índice existente de las tablas indicadas, en orden: {tabla: [(col1, col2, ...), ...]}
+async def indices_existentes(db: aiomysql.Connection, tablas: set) -> dict:
+    marcadores = ", ".join(["%s"] * len(tablas))
+    query = f" \
+        select s.table_name as tabla, \
+            s.index_name as indice, \
+            s.column_name as columna \
+        from information_schema.statistics s \
+        where s.table_schema = database() and \
+            s.table_name in ({marcadores}) \
+        order by s.table_name asc, \
+            s.index_name asc, \
+            s.seq_in_index asc"
+    async with db.cursor() as cursor:
+        await cursor.execute(query, tuple(sorted(tablas)))
+        result = await cursor.fetchall()
+
+    indices = {}
+    for tabla, indice, columna in result:
+        indices.setdefault(tabla.lower(), {}).setdefault(indice, []).append(columna.lower())
+    return {tabla: [tuple(columnas) for columnas in por_indice.values()] for tabla, por_indice in indices.items()}
+
+
+# Separa los candidatos entre los ya cubiertos (sus columnas son prefijo izquierdo de un índice existente) y los
+# recomendados, con su DDL
+async def recomienda_indices(db: aiomysql.Connection) -> dict:
+    existentes = await indices_existentes(db, {tabla for tabla, columnas, uso in INDICES_CANDIDATOS})
+
+    recomendados = []
+    cubiertos = []
+    for tabla, columnas, uso in INDICES_CANDIDATOS:
+        cubierto_por = [indice for indice in existentes.get(tabla, []) if indice[:len(columnas)] == columnas]
+        elemento = {"tabla": tabla, "columnas": list(columnas), "uso": uso}
+        if cubierto_por:
+            elemento["cubierto_por"] = list(cubierto_por[0])
+            cubiertos.append(elemento)
+        else:
+            elemento["ddl"] = f"create index {nombre_indice(tabla, columnas)} on {tabla} ({', '.join(columnas)})"
+            recomendados.append(elemento)
+
+    return {"recomendados": recomendados, "cubiertos": cubiertos}
+
+
+async def aplica_indices(db: aiomysql.Connection, recomendados: list):
+    async with db.cursor() as cursor:
+        for elemento in recomendados:
+            await cursor.execute(elemento["ddl"])
+        # Actualiza las estadísticas para que el optimizador considere los índices nuevos
+        for tabla in sorted({elemento["tabla"] for elemento in recomendados}):
+            await cursor.execute(f"analyze table {tabla}")
+            await cursor.fetchall()
+
+
+# Elimina los índices creados por aplica_indices, para repetir la medición sin ellos
+async def elimina_indices(db: aiomysql.Connection) -> list:
+    async with db.cursor() as cursor:
+        await cursor.execute("select distinct s.table_name, s.index_name from information_schema.statistics s where s.table_schema = database()")
+        nombres = {(tabla.lower(), indice) for tabla, indice in await cursor.fetchall()}
+
+        eliminados = []
+        for tabla, columnas, uso in INDICES_CANDIDATOS:
+            nombre = nombre_indice(tabla, columnas)
+            if (tabla, nombre) not in nombres:
+                continue
+            try:
+                await cursor.execute(f"drop index {nombre} on {tabla}")
+                eliminados.append(nombre)
+            except aiomysql.Error as e:
+                # MySQL descarta el índice automático de una clave foránea cuando otro índice la cubre; en ese caso el
+                # índice recomendado quedó sosteniendo la clave foránea y no se puede eliminar
+                if "1553" not in str(e):
+                    raise
+                print(f"No se elimina {nombre}: lo usa una clave foránea")
+    return eliminados
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import aiomysql
+from fastapi import HTTPException
+from fastapi import status
+
+from infrastructure.cache import memo_solicitud
+from infrastructure.metricas import CursorInstrumentado
+
+
+# Parámetros de conexión a la base de datos
+DB_HOST: str = "localhost"
+DB_PORT: int = 3306
+DB_USER: str = "root"
+DB_PASSWORD: str = "root"
+DB_NAME: str = "admtaller_bd"
+
+# Parámetros del pool de conexiones
+DB_POOL_MINSIZE: int = 2
+DB_POOL_MAXSIZE: int = 20
+# Segundos sin uso tras los cuales una conexión del pool se descarta y se vuelve a abrir
+# (debe ser menor al wait_timeout del servidor MySQL)
+DB_POOL_RECYCLE: int = 3600
+# Segundos máximos de espera por una conexión libre antes de responder error
+DB_POOL_TIMEOUT: float = 10.0
+
+# Pool de conexiones compartido por toda la aplicación
+pool: aiomysql.Pool = None
+
+# Contadores para observar el uso del pool
+estadisticas_pool = {
+    "checkouts": 0,
+    "checkouts_fallidos": 0,
+    "conexiones_descartadas": 0,
+    "tiempo_espera_total": 0.0,
+    "tiempo_espera_max": 0.0,
+}
+
+
+async def create_pool():
+    global pool
+    if pool is not None:
+        return pool
+
+    try:
+        pool = await aiomysql.create_pool(
+            host=DB_HOST,
+            port=DB_PORT,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            db=DB_NAME,
+            autocommit=True,
+            minsize=DB_POOL_MINSIZE,
+            maxsize=DB_POOL_MAXSIZE,
+            pool_recycle=DB_POOL_RECYCLE,
+            # Cada sentencia queda medida y asociada al handler que la ejecuta (ver infrastructure.metricas)
+            cursorclass=CursorInstrumentado,
+        )
+        return pool
+    except aiomysql.Error as e:
+        # Maneja la excepción y muestra un mensaje de error personalizado
+        print(f"Error al crear el pool de conexiones a la base de datos: {e}")
+        return None
+
+
+async def close_pool():
+    global pool
+    if pool is None:
+        return
+
+    # Espera a que las conexiones en uso sean devueltas antes de cerrarlas
+    pool.close()
+    await pool.wait_closed()
+    pool = None
+
+
+async def get_db_connection():
+    # Si el pool no se inicializó (por ejemplo, la base de datos no estaba disponible al partir), se reintenta
+    if pool is None:
+        await create_pool()
+        if pool is None:
+            return None
+
+    # Se reintenta una vez si la conexión entregada por el pool no responde
+    for intento in range(2):
+        inicio = time.monotonic()
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), timeout=DB_POOL_TIMEOUT)
+        except (asyncio.TimeoutError, aiomysql.Error, OSError) as e:
+            estadisticas_pool["checkouts_fallidos"] += 1
+            print(f"Error al obtener una conexión del pool: {e}")
+            return None
+
+        espera = time.monotonic() - inicio
+        estadisticas_pool["tiempo_espera_total"] += espera
+        estadisticas_pool["tiempo_espera_max"] = max(estadisticas_pool["tiempo_espera_max"], espera)
+
+        # Verificación de salud de la conexión antes de entregarla
+        try:
+            await conn.ping(reconnect=False)
+        except Exception:
+            estadisticas_pool["conexiones_descartadas"] += 1
+            conn.close()
+            pool.release(conn)
+            continue
+
+        estadisticas_pool["checkouts"] += 1
+        return conn
+
+    estadisticas_pool["checkouts_fallidos"] += 1
+    return None
+
+
+def release_db_connection(conn):
+    if conn is None:
+        return
+    if pool is None:
+        conn.close()
+        return
+    pool.release(conn)
+
+
+# Presta una conexión del pool mientras dure el bloque "async with" y la devuelve al salir.
+# Permite usar conexiones adicionales para ejecutar consultas independientes en paralelo
+@asynccontextmanager
+async def conexion_db():
+    db = await get_db_connection()
+    if db is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error al conectar a la base de datos")
+
+    try:
+        yield db
+    finally:
+        release_db_connection(db)
+
+
+# Dependencia FastAPI: presta una conexión del pool durante la atención del request y la devuelve al terminar.
+# También abre el memo de la solicitud, que se descarta al terminar aunque la aplicación se ejecute en la misma tarea
+# del cliente (por ejemplo, con httpx.ASGITransport)
+async def get_db():
+    token = memo_solicitud.set({})
+    try:
+        async with conexion_db() as db:
+            yield db
+    finally:
+        memo_solicitud.reset(token)
+
+
+def pool_estadisticas() -> dict:
+    checkouts = estadisticas_pool["checkouts"]
+    return {
+        "minsize": DB_POOL_MINSIZE,
+        "maxsize": DB_POOL_MAXSIZE,
+        "size": pool.size if pool is not None else 0,
+        "freesize": pool.freesize if pool is not None else 0,
+        "en_uso": (pool.size - pool.freesize) if pool is not None else 0,
+        "checkouts": checkouts,
+        "checkouts_fallidos": estadisticas_pool["checkouts_fallidos"],
+        "conexiones_descartadas": estadisticas_pool["conexiones_descartadas"],
+        "tiempo_espera_promedio": (estadisticas_pool["tiempo_espera_total"] / checkouts) if checkouts else 0.0,
+        "tiempo_espera_max": estadisticas_pool["tiempo_espera_max"],
+    }
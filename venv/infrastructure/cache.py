@@ -0,0 +1,59 @@
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any
+from typing import Hashable
+
+
+# Caché en memoria del proceso con expiración por tiempo (TTL) y descarte del elemento menos usado (LRU)
+class CacheTTL:
+
+    def __init__(self, ttl: float, max_elementos: int):
+        self.ttl = ttl
+        self.max_elementos = max_elementos
+        self._datos: OrderedDict = OrderedDict()
+        self.aciertos: int = 0
+        self.fallos: int = 0
+
+    # Retorna el valor almacenado o None si no existe o ya expiró
+    def get(self, clave: Hashable) -> Any:
+        elemento = self._datos.get(clave)
+        if elemento is None:
+            self.fallos += 1
+            return None
+
+        expira, valor = elemento
+        if expira < time.monotonic():
+            del self._datos[clave]
+            self.fallos += 1
+            return None
+
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def set(self, clave: Hashable, valor: Any, ttl: float = None):
+        self._datos[clave] = (time.monotonic() + (ttl if ttl is not None else self.ttl), valor)
+        self._datos.move_to_end(clave)
+        while len(self._datos) > self.max_elementos:
+            self._datos.popitem(last=False)
+
+    def invalidar(self, clave: Hashable):
+        self._datos.pop(clave, None)
+
+    def limpiar(self):
+        self._datos.clear()
+
+    def estadisticas(self) -> dict:
+        return {
+            "elementos": len(self._datos),
+            "max_elementos": self.max_elementos,
+            "ttl": self.ttl,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+        }
+
+
+# Memo de la solicitud en curso: evita repetir una misma búsqueda dentro de un request. La dependencia get_db crea
+# un diccionario nuevo al comenzar cada request y lo descarta al terminar; fuera de un request no hay memo (None)
+memo_solicitud: ContextVar = ContextVar("memo_solicitud", default=None)
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import time
+from abc import ABC
+from abc import abstractmethod
+from email.utils import formatdate
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from fastapi import Request
+from fastapi import Response
+from fastapi import status
+from fastapi.encoders import jsonable_encoder
+
+from infrastructure.cache import CacheTTL
+
+
+# Segundos que una entrada de catálogo permanece en caché si no es invalidada antes
+TTL_CATALOGO: int = 3600
+
+
+# Interfaz de almacenamiento para la caché de catálogos. Los valores son cadenas JSON, de modo que
+# un almacén compartido tipo Redis (GET / SET EX / INCR) pueda implementarla y así varios workers
+# de uvicorn compartan tanto los datos como las invalidaciones
+class BackendCache(ABC):
+
+    @abstractmethod
+    async def get(self, clave: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def set(self, clave: str, valor: str, ttl: int):
+        pass
+
+    # Incrementa un contador (sin expiración) y retorna su nuevo valor
+    @abstractmethod
+    async def incr(self, clave: str) -> int:
+        pass
+
+    def estadisticas(self) -> dict:
+        return {}
+
+
+# Backend por omisión: memoria del proceso. Las invalidaciones sólo afectan al worker que las ejecuta
+class BackendMemoria(BackendCache):
+
+    def __init__(self, max_elementos: int = 500):
+        self._valores = CacheTTL(ttl=TTL_CATALOGO, max_elementos=max_elementos)
+        self._contadores: dict = {}
+
+    async def get(self, clave: str) -> Optional[str]:
+        if clave in self._contadores:
+            return str(self._contadores[clave])
+        return self._valores.get(clave)
+
+    async def set(self, clave: str, valor: str, ttl: int):
+        self._valores.set(clave, valor, ttl)
+
+    async def incr(self, clave: str) -> int:
+        self._contadores[clave] = self._contadores.get(clave, 0) + 1
+        return self._contadores[clave]
+
+    def estadisticas(self) -> dict:
+        return self._valores.estadisticas()
+
+
+# Caché de lectura (read-through) para tablas de catálogo, con claves versionadas por espacio de nombres
+class CacheCatalogo:
+
+    def __init__(self, backend: BackendCache, ttl: int = TTL_CATALOGO):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def version(self, espacio: str) -> int:
+        version = await self.backend.get(f"catalogo:{espacio}:version")
+        return int(version) if version is not None else 0
+
+    # Retorna la entrada {datos, etag, last_modified} desde la caché o la construye con el cargador
+    async def obtener(self, espacio: str, subclave: str, cargador: Callable[[], Awaitable]) -> dict:
+        version = await self.version(espacio)
+        clave = f"catalogo:{espacio}:v{version}:{subclave}"
+
+        valor = await self.backend.get(clave)
+        if valor is not None:
+            return json.loads(valor)
+
+        datos = jsonable_encoder(await cargador())
+        serializado = json.dumps(datos, sort_keys=True, separators=(",", ":"))
+        entrada = {
+            "datos": datos,
+            "etag": '"' + hashlib.sha1(serializado.encode("utf-8")).hexdigest() + '"',
+            "last_modified": time.time(),
+        }
+        await self.backend.set(clave, json.dumps(entrada), self.ttl)
+        return entrada
+
+    # Invalida todas las entradas de un espacio de nombres al cambiar su versión
+    async def invalidar(self, espacio: str):
+        await self.backend.incr(f"catalogo:{espacio}:version")
+
+
+cache_catalogo = CacheCatalogo(BackendMemoria())
+
+
+# Permite reemplazar el backend de la caché, por ejemplo por uno compartido entre workers
+def configura_backend_catalogo(backend: BackendCache):
+    cache_catalogo.backend = backend
+
+
+def _etag_coincide(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato.startswith("W/"):
+            candidato = candidato[2:]
+        if candidato == etag:
+            return True
+    return False
+
+
+# Responde un catálogo desde la caché agregando ETag / Last-Modified, o un 304 si el cliente ya tiene la versión vigente
+async def responder_catalogo(request: Request, response: Response, espacio: str, subclave: str, cargador: Callable[[], Awaitable]):
+    entrada = await cache_catalogo.obtener(espacio, subclave, cargador)
+    if request is None or response is None:
+        return entrada["datos"]
+
+    headers = {
+        "ETag": entrada["etag"],
+        "Last-Modified": formatdate(entrada["last_modified"], usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_coincide(if_none_match, entrada["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return entrada["datos"]
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import aiomysql
+
+from database import conexion_db
+from infrastructure.constants import Const
+
+
+# Segundos entre refrescos periódicos del snapshot del dashboard
+INTERVALO_REFRESCO: float = 300.0
+# Segundos de espera tras una modificación antes de refrescar, para agrupar varias escrituras seguidas
+ESPERA_TRAS_MODIFICACION: float = 2.0
+
+# Conceptos del dashboard por carrera, en el orden en que se presentan
+CONCEPTOS_CARRERA = ("Cantidad de asignaturas",
+                     "Cantidad de talleres",
+                     "Cantidad de productos",
+                     "Cantidad de docentes")
+
+QUERY_DASHBOARD = f" \
+    select c.cod_carrera as cod_carrera, \
+        c.nom_carrera as nom_carrera, \
+        0 as orden, \
+        count(*) as valor \
+    from asign a \
+    join carrera c on a.cod_carrera = c.cod_carrera \
+    group by c.cod_carrera, \
+        c.nom_carrera \
+    union all \
+    select c.cod_carrera as cod_carrera, \
+        c.nom_carrera as nom_carrera, \
+        1 as orden, \
+        count(*) as valor \
+    from taller t \
+    join asign a on t.sigla = a.sigla \
+    join carrera c on a.cod_carrera = c.cod_carrera \
+    group by c.cod_carrera, \
+        c.nom_carrera \
+    union all \
+    select c.cod_carrera as cod_carrera, \
+        c.nom_carrera as nom_carrera, \
+        2 as orden, \
+        count(distinct ct.id_producto) as valor \
+    from config_taller ct \
+    join taller t on ct.id_taller = t.id_taller \
+    join asign a on t.sigla = a.sigla \
+    join carrera c on a.cod_carrera = c.cod_carrera \
+    group by c.cod_carrera, \
+        c.nom_carrera \
+    union all \
+    select c.cod_carrera as cod_carrera, \
+        c.nom_carrera as nom_carrera, \
+        3 as orden, \
+        count(*) as valor \
+    from usuario u \
+    join carrera c on u.cod_carrera = c.cod_carrera \
+    where u.cod_perfil = {Const.K_DOCENTE.value} \
+    group by c.cod_carrera, \
+        c.nom_carrera \
+    order by nom_carrera asc, \
+        orden asc"
+
+
+# Snapshot de los contadores del dashboard por carrera, refrescado en segundo plano
+class SnapshotDashboard:
+
+    def __init__(self):
+        # Filas (cod_carrera, nom_carrera, concepto, valor) ordenadas por carrera y concepto
+        self.filas: list = None
+        self.generado: float = None
+        self._modificado = asyncio.Event()
+        # Evita que varias solicitudes construyan el snapshot a la vez mientras aún no existe
+        self._construccion = asyncio.Lock()
+        self._tarea: asyncio.Task = None
+
+    def antiguedad(self) -> float:
+        if self.generado is None:
+            return None
+        return time.time() - self.generado
+
+    async def refresca(self, db: aiomysql.Connection):
+        async with db.cursor() as cursor:
+            await cursor.execute(QUERY_DASHBOARD)
+            result = await cursor.fetchall()
+
+        self.filas = [(row[0], row[1], CONCEPTOS_CARRERA[row[2]], row[3]) for row in result]
+        self.generado = time.time()
+
+    # Retorna las filas vigentes, construyendo el snapshot si aún no existe
+    async def obtiene(self, db: aiomysql.Connection) -> list:
+        if self.filas is None:
+            async with self._construccion:
+                if self.filas is None:
+                    await self.refresca(db)
+        return self.filas
+
+    # Solicita un refresco anticipado luego de modificar asign, taller, config_taller o usuario
+    def marca_modificado(self):
+        self._modificado.set()
+
+    # El primer refresco se hace al iniciar, para que el snapshot esté listo antes de atender la página principal
+    async def _ciclo_refresco(self):
+        while True:
+            try:
+                async with conexion_db() as db:
+                    if self.filas is None:
+                        async with self._construccion:
+                            if self.filas is None:
+                                await self.refresca(db)
+                    else:
+                        await self.refresca(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error al refrescar el snapshot del dashboard: {e}")
+
+            try:
+                await asyncio.wait_for(self._modificado.wait(), timeout=INTERVALO_REFRESCO)
+                await asyncio.sleep(ESPERA_TRAS_MODIFICACION)
+            except asyncio.TimeoutError:
+                pass
+            self._modificado.clear()
+
+    def inicia(self):
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._ciclo_refresco())
+
+    async def detiene(self):
+        if self._tarea is None:
+            return
+        self._tarea.cancel()
+        try:
+            await self._tarea
+        except asyncio.CancelledError:
+            pass
+        self._tarea = None
+
+
+snapshot_dashboard = SnapshotDashboard()
@@ -0,0 +1,168 @@
+import base64
+import csv
+import datetime
+import decimal
+import io
+import json
+from typing import Callable
+from typing import List
+
+import aiomysql
+from fastapi import HTTPException
+from fastapi import status
+from fastapi.responses import StreamingResponse
+
+from infrastructure.metricas import SSCursorInstrumentado
+
+
+# Formatos de salida disponibles para las consultas extensas
+K_FORMATO_JSON: str = "json"
+K_FORMATO_NDJSON: str = "ndjson"
+K_FORMATO_CSV: str = "csv"
+FORMATOS: tuple = (K_FORMATO_JSON, K_FORMATO_NDJSON, K_FORMATO_CSV)
+
+# Filas leídas desde el cursor de servidor en cada viaje a la base de datos
+K_FILAS_POR_LOTE: int = 500
+
+
+def valida_formato(formato: str) -> str:
+    formato = (formato or K_FORMATO_JSON).lower()
+    if formato not in FORMATOS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Formato no soportado: {formato}. Formatos válidos: {', '.join(FORMATOS)}")
+    return formato
+
+
+def _valor_json(valor):
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return valor.isoformat()
+    if isinstance(valor, decimal.Decimal):
+        return int(valor) if valor == valor.to_integral_value() else float(valor)
+    raise TypeError(f"Tipo no serializable: {type(valor)}")
+
+
+# El cursor de paginación es la lista de valores de las columnas del ORDER BY de la última fila entregada
+def codifica_cursor(valores: list) -> str:
+    texto = json.dumps(valores, default=_valor_json, separators=(",", ":"))
+    return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodifica_cursor(cursor: str, cantidad_columnas: int) -> list:
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginación inválido")
+
+    if not isinstance(valores, list) or len(valores) != cantidad_columnas:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginación inválido")
+    return valores
+
+
+# Condición keyset para continuar después del cursor: (c1, c2, ...) > (v1, v2, ...)
+def filtro_cursor(columnas: List[str]) -> str:
+    return f"({', '.join(columnas)}) > ({', '.join(['%s'] * len(columnas))})"
+
+
+# Lee las filas con un cursor del lado del servidor (SSCursor), sin cargar el resultado completo en memoria
+class LectorStreaming:
+
+    def __init__(self, db: aiomysql.Connection, cursor: aiomysql.SSCursor, primeras: list):
+        self.db = db
+        self.cursor = cursor
+        self.primeras = primeras
+        self.completo: bool = False
+
+    # Entrega las filas ya leídas y continúa leyendo del cursor
+    async def filas(self):
+        filas = self.primeras
+        while filas:
+            for fila in filas:
+                yield fila
+            filas = await self.cursor.fetchmany(K_FILAS_POR_LOTE)
+        self.completo = True
+
+    # Si el stream no terminó (cliente desconectado o error al leer) el resto del resultado sigue pendiente en la
+    # conexión: se cierra para que el pool la descarte en vez de prestarla con un resultado a medio leer
+    async def cierra(self):
+        if self.completo:
+            await self.cursor.close()
+        else:
+            self.db.close()
+
+
+async def _ndjson(filas, convertidor: Callable):
+    lote: List[str] = []
+    async for fila in filas:
+        lote.append(json.dumps(convertidor(fila), default=_valor_json, ensure_ascii=False))
+        if len(lote) >= K_FILAS_POR_LOTE:
+            yield "\n".join(lote) + "\n"
+            lote = []
+    if lote:
+        yield "\n".join(lote) + "\n"
+
+
+async def _csv(filas, columnas: List[str], convertidor: Callable):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    # El BOM permite que las planillas de cálculo reconozcan la codificación UTF-8
+    buffer.write("\ufeff")
+    escritor.writerow(columnas)
+
+    cantidad = 0
+    async for fila in filas:
+        registro = convertidor(fila)
+        escritor.writerow([registro[columna] for columna in columnas])
+        cantidad += 1
+        if cantidad % K_FILAS_POR_LOTE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+
+# Starlette no cierra el generador del cuerpo cuando el cliente se desconecta; se cierra aquí junto con el lector,
+# antes de que la dependencia get_db devuelva la conexión al pool
+class RespuestaStreaming(StreamingResponse):
+
+    def __init__(self, lector: LectorStreaming, content, **kwargs):
+        super().__init__(content, **kwargs)
+        self.lector = lector
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+            await self.lector.cierra()
+
+
+# Respuesta en streaming (NDJSON o CSV) alimentada directamente desde el cursor de servidor. La consulta y la primera
+# lectura se ejecutan antes de enviar los encabezados, para que un error de base de datos se informe con su código
+async def respuesta_streaming(db: aiomysql.Connection, query: str, values: tuple, formato: str, columnas: List[str], convertidor: Callable, nombre_archivo: str) -> StreamingResponse:
+    try:
+        cursor = db.cursor(SSCursorInstrumentado)
+        await cursor.execute(query, values)
+        primeras = await cursor.fetchmany(K_FILAS_POR_LOTE)
+
+    except aiomysql.Error as e:
+        error_message = str(e)
+        if "Connection" in error_message:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error al conectar a la base de datos")
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error en la consulta a la base de datos. DBerror {error_message}")
+
+    except Exception as e:
+        # El resultado pudo quedar a medio leer
+        db.close()
+        error_message = str(e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error en la base de datos. DBError {error_message}")
+
+    lector = LectorStreaming(db, cursor, primeras)
+
+    if formato == K_FORMATO_CSV:
+        return RespuestaStreaming(lector, _csv(lector.filas(), columnas, convertidor),
+                                  media_type="text/csv; charset=utf-8",
+                                  headers={"Content-Disposition": f'attachment; filename="{nombre_archivo}.csv"'})
+
+    return RespuestaStreaming(lector, _ndjson(lector.filas(), convertidor), media_type="application/x-ndjson")
@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import json
+
+import aiomysql
+from fastapi import HTTPException
+from fastapi import status
+
+from database import conexion_db
+from infrastructure.cache import CacheTTL
+
+
+# Segundos durante los que se conserva el resultado de una clave de idempotencia
+TTL_IDEMPOTENCIA: int = 86400
+# Segundos entre purgas periódicas de las claves vencidas
+INTERVALO_PURGA: float = 3600.0
+
+# Resultado de cada operación ejecutada con clave de idempotencia. La fila se reserva dentro de la misma
+# transacción de la operación, por lo que un reintento concurrente con la misma clave espera a que la
+# primera termine y luego encuentra su resultado
+DDL_IDEMPOTENCIA = " \
+    create table if not exists clave_idempotencia ( \
+        clave varchar(100) not null, \
+        huella char(40) not null, \
+        respuesta mediumtext null, \
+        fecha_creacion timestamp not null default current_timestamp, \
+        primary key (clave) \
+    )"
+
+# Resultados recientes en memoria, para responder los reintentos sin consultar la base de datos
+cache_idempotencia = CacheTTL(TTL_IDEMPOTENCIA, 10000)
+
+
+# Crea la tabla si no existe y descarta las claves vencidas
+async def asegura_idempotencia(db: aiomysql.Connection):
+    async with db.cursor() as cursor:
+        await cursor.execute(DDL_IDEMPOTENCIA)
+    await purga_claves(db)
+
+
+async def purga_claves(db: aiomysql.Connection) -> int:
+    async with db.cursor() as cursor:
+        await cursor.execute("delete from clave_idempotencia where fecha_creacion < now() - interval %s second", (TTL_IDEMPOTENCIA,))
+        return cursor.rowcount
+
+
+# Huella de la solicitud, para detectar una misma clave reutilizada con datos distintos
+def huella_solicitud(datos) -> str:
+    return hashlib.sha1(json.dumps(datos, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _verifica_huella(clave: str, huella: str, huella_guardada: str):
+    if huella != huella_guardada:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"La clave de idempotencia {clave} ya fue usada con datos distintos")
+
+
+# Retorna el resultado guardado en memoria para la clave, o None si no se conoce
+def resultado_en_cache(clave: str, huella: str):
+    elemento = cache_idempotencia.get(clave)
+    if elemento is None:
+        return None
+
+    _verifica_huella(clave, huella, elemento[0])
+    return elemento[1]
+
+
+# Reserva la clave dentro de la transacción en curso. Si ya estaba registrada retorna su resultado guardado;
+# si no, retorna None y la operación debe continuar, llamar a guarda_resultado antes del commit y a recuerda_resultado después
+async def reserva_clave(db: aiomysql.Connection, clave: str, huella: str):
+    try:
+        async with db.cursor() as cursor:
+            # Una clave vencida que aún no se purga queda libre para una operación nueva
+            await cursor.execute("delete from clave_idempotencia where clave = %s and fecha_creacion < now() - interval %s second", (clave, TTL_IDEMPOTENCIA))
+            await cursor.execute("insert into clave_idempotencia (clave, huella) values (%s, %s)", (clave, huella))
+        return None
+
+    except aiomysql.Error as e:
+        if "1062" not in str(e):
+            raise
+
+    async with db.cursor() as cursor:
+        await cursor.execute(" \
+            select huella, \
+                respuesta, \
+                timestampdiff(second, now(), fecha_creacion + interval %s second) as vigencia \
+            from clave_idempotencia \
+            where clave = %s and \
+                fecha_creacion >= now() - interval %s second", (TTL_IDEMPOTENCIA, clave, TTL_IDEMPOTENCIA))
+        result = await cursor.fetchone()
+
+    if result is None or result[1] is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"La operación con clave de idempotencia {clave} aún está en proceso")
+
+    _verifica_huella(clave, huella, result[0])
+    resultado = json.loads(result[1])
+    # En memoria se conserva sólo mientras la clave siga vigente en la base de datos
+    cache_idempotencia.set(clave, (huella, resultado), ttl=max(result[2], 0))
+    return resultado
+
+
+async def guarda_resultado(db: aiomysql.Connection, clave: str, resultado):
+    async with db.cursor() as cursor:
+        await cursor.execute("update clave_idempotencia set respuesta = %s where clave = %s", (json.dumps(resultado, default=str), clave))
+
+
+# Se llama después del commit, para que sólo se recuerden resultados efectivamente confirmados
+def recuerda_resultado(clave: str, huella: str, resultado):
+    cache_idempotencia.set(clave, (huella, resultado))
+
+
+# Purga periódica en segundo plano de las claves vencidas, para que la tabla no crezca sin límite en un proceso
+# de larga duración
+class PurgaIdempotencia:
+
+    def __init__(self):
+        self._tarea: asyncio.Task = None
+
+    async def _ciclo_purga(self):
+        while True:
+            await asyncio.sleep(INTERVALO_PURGA)
+            try:
+                async with conexion_db() as db:
+                    await purga_claves(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error al purgar las claves de idempotencia: {e}")
+
+    def inicia(self):
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._ciclo_purga())
+
+    async def detiene(self):
+        if self._tarea is None:
+            return
+        self._tarea.cancel()
+        try:
+            await self._tarea
+        except asyncio.CancelledError:
+            pass
+        self._tarea = None
+
+
+purga_idempotencia = PurgaIdempotencia()
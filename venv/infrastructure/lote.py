@@ -0,0 +1,101 @@
+from typing import Awaitable
+from typing import Callable
+from typing import List
+from typing import Tuple
+
+import aiomysql
+from fastapi import Response
+from fastapi import status
+
+from models.lote import ResultadoLote
+from models.lote import RespuestaLote
+
+
+def resultado_error(indice: int, error_message: str) -> ResultadoLote:
+    # Controlamos de manera especial el error de registro existente
+    if "1062" in error_message:
+        return ResultadoLote(indice=indice, estado=status.HTTP_409_CONFLICT, msg_error=f"Error al insertar registro existente. DBerror {error_message}")
+    return ResultadoLote(indice=indice, estado=status.HTTP_400_BAD_REQUEST, msg_error=f"Error en la consulta a la base de datos. DBerror {error_message}")
+
+
+# Errores que invalidan la transacción completa o la conexión, y que por lo tanto no se informan por elemento
+def error_fatal(error_message: str) -> bool:
+    return "Connection" in error_message or "1213" in error_message
+
+
+# Inserta los elementos válidos de un lote dentro de una sola transacción.
+#   elementos: lista de (índice en el lote, values de la sentencia)
+#   invalidos: resultados de los elementos descartados antes de llegar a la base de datos
+#   al_confirmar: se ejecuta dentro de la transacción, con los índices insertados, justo antes del commit
+# Primero se intenta una inserción multi-fila (executemany). Si falla por algún elemento se vuelve al savepoint previo y
+# se reintenta elemento a elemento dentro de la misma transacción para informar el resultado de cada uno. El savepoint
+# es necesario porque executemany divide el lote en varias sentencias si supera max_stmt_length, y las que ya se
+# ejecutaron no se deshacen con el error de una posterior
+async def inserta_lote(db: aiomysql.Connection, query: str, elementos: List[Tuple[int, tuple]], invalidos: List[ResultadoLote], todo_o_nada: bool,
+                       al_confirmar: Callable[[aiomysql.Connection, List[int]], Awaitable] = None) -> RespuestaLote:
+    resultados = {resultado.indice: resultado for resultado in invalidos}
+
+    if elementos and not (todo_o_nada and invalidos):
+        await db.begin()
+        try:
+            async with db.cursor() as cursor:
+                await cursor.execute("savepoint lote")
+                try:
+                    await cursor.executemany(query, [values for indice, values in elementos])
+                    for indice, values in elementos:
+                        resultados[indice] = ResultadoLote(indice=indice, estado=status.HTTP_200_OK)
+
+                except aiomysql.Error as e:
+                    if error_fatal(str(e)):
+                        raise
+
+                    await cursor.execute("rollback to savepoint lote")
+                    for indice, values in elementos:
+                        try:
+                            await cursor.execute(query, values)
+                            resultados[indice] = ResultadoLote(indice=indice, estado=status.HTTP_200_OK)
+                        except aiomysql.Error as e:
+                            if error_fatal(str(e)):
+                                raise
+                            resultados[indice] = resultado_error(indice, str(e))
+
+            insertados = [indice for indice, resultado in resultados.items() if resultado.estado == status.HTTP_200_OK]
+            if len(insertados) == len(resultados) or (insertados and not todo_o_nada):
+                if al_confirmar is not None:
+                    await al_confirmar(db, insertados)
+                await db.commit()
+            else:
+                await db.rollback()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+    insertados = [indice for indice, resultado in resultados.items() if resultado.estado == status.HTTP_200_OK]
+    con_error = len(resultados) - len(insertados)
+    confirmado = not con_error or (bool(insertados) and not todo_o_nada)
+
+    if not confirmado:
+        # Los elementos válidos que no se insertaron por el error de otro elemento se informan como tales
+        for indice, values in elementos:
+            if indice not in resultados or resultados[indice].estado == status.HTTP_200_OK:
+                resultados[indice] = ResultadoLote(indice=indice, estado=status.HTTP_424_FAILED_DEPENDENCY, msg_error="No insertado por error en otro elemento del lote")
+
+    respuesta = RespuestaLote(confirmado=confirmado,
+                              insertados=len(insertados) if confirmado else 0,
+                              con_error=con_error,
+                              msg_error=None if confirmado else "Lote rechazado: ningún elemento fue insertado",
+                              resultados=[resultados[indice] for indice in sorted(resultados)])
+
+    return respuesta
+
+
+# Código HTTP de la respuesta completa: 200 si todo se insertó, 207 si fue parcial y el del primer error si nada se insertó
+def estado_lote(respuesta: RespuestaLote, response: Response):
+    if not respuesta.con_error:
+        response.status_code = status.HTTP_200_OK
+    elif respuesta.confirmado:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    else:
+        errores = [resultado.estado for resultado in respuesta.resultados if resultado.estado != status.HTTP_424_FAILED_DEPENDENCY]
+        response.status_code = status.HTTP_409_CONFLICT if status.HTTP_409_CONFLICT in errores else status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,294 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+
+import aiomysql
+
+
+# Consultas SQL que superan este umbral (en segundos) se informan en el log de consultas lentas. Se puede ajustar sin
+# modificar el código con la variable de ambiente ADMTALLER_UMBRAL_CONSULTA_LENTA
+UMBRAL_CONSULTA_LENTA: float = float(os.environ.get("ADMTALLER_UMBRAL_CONSULTA_LENTA", "0.5"))
+# Cantidad de consultas lentas recientes que se conservan para el diagnóstico
+MAX_CONSULTAS_LENTAS: int = 100
+# Largo máximo del texto SQL que se guarda en el log de consultas lentas
+MAX_LARGO_SQL: int = 500
+
+# Límites superiores (en segundos) de los intervalos de los histogramas de latencia
+INTERVALOS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Encabezado de la solicitud que activa el perfilado; el desglose se retorna en el encabezado Server-Timing
+ENCABEZADO_PERFILADO: bytes = b"x-perfilado"
+
+# Handler al que se asignan las consultas ejecutadas fuera de un request, por ejemplo en tareas de segundo plano
+K_SIN_HANDLER: str = "segundo_plano"
+
+# Log de consultas lentas; su nivel y destino se configuran con el módulo logging (por ejemplo, en la configuración de uvicorn)
+logger_consultas_lentas = logging.getLogger("admtaller.consultas_lentas")
+
+
+class Histograma:
+
+    def __init__(self):
+        self.conteos = [0] * len(INTERVALOS_LATENCIA)
+        self.suma: float = 0.0
+        self.cantidad: int = 0
+
+    def observa(self, valor: float):
+        self.suma += valor
+        self.cantidad += 1
+        for i, limite in enumerate(INTERVALOS_LATENCIA):
+            if valor <= limite:
+                self.conteos[i] += 1
+                break
+
+
+# Métricas acumuladas del proceso, expuestas en formato de texto Prometheus en /metrics
+class Metricas:
+
+    def __init__(self):
+        # Claves (metodo, ruta, estado)
+        self.solicitudes: dict = {}
+        # Claves (metodo, ruta)
+        self.latencia_solicitudes: dict = {}
+        # Claves handler
+        self.latencia_consultas: dict = {}
+        self.filas_consultas: dict = {}
+        self.consultas_lentas: dict = {}
+        self.errores_consultas: dict = {}
+        self.log_consultas_lentas: deque = deque(maxlen=MAX_CONSULTAS_LENTAS)
+
+    def registra_solicitud(self, metodo: str, ruta: str, estado: int, duracion: float):
+        clave = (metodo, ruta, str(estado))
+        self.solicitudes[clave] = self.solicitudes.get(clave, 0) + 1
+        self.latencia_solicitudes.setdefault((metodo, ruta), Histograma()).observa(duracion)
+
+    def registra_consulta(self, handler: str, query: str, duracion: float, filas: int, error: bool):
+        self.latencia_consultas.setdefault(handler, Histograma()).observa(duracion)
+        if filas > 0:
+            self.filas_consultas[handler] = self.filas_consultas.get(handler, 0) + filas
+        if error:
+            self.errores_consultas[handler] = self.errores_consultas.get(handler, 0) + 1
+
+        if duracion >= UMBRAL_CONSULTA_LENTA:
+            self.consultas_lentas[handler] = self.consultas_lentas.get(handler, 0) + 1
+            sql = " ".join(str(query).split())[:MAX_LARGO_SQL]
+            self.log_consultas_lentas.append({
+                "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "handler": handler,
+                "duracion": round(duracion, 4),
+                "filas": filas,
+                "sql": sql,
+            })
+            logger_consultas_lentas.warning("Consulta lenta (%.3fs, %s filas) en %s: %s", duracion, filas, handler, sql)
+
+    def texto_prometheus(self, estadisticas_pool: dict) -> str:
+        lineas = []
+
+        lineas.append("# HELP admtaller_http_solicitudes_total Solicitudes HTTP atendidas por ruta y código de estado")
+        lineas.append("# TYPE admtaller_http_solicitudes_total counter")
+        for (metodo, ruta, estado), valor in sorted(self.solicitudes.items()):
+            lineas.append(f"admtaller_http_solicitudes_total{_etiquetas(metodo=metodo, ruta=ruta, estado=estado)} {valor}")
+
+        lineas.append("# HELP admtaller_http_duracion_segundos Latencia de las solicitudes HTTP por ruta, hasta el último byte de la respuesta")
+        lineas.append("# TYPE admtaller_http_duracion_segundos histogram")
+        for (metodo, ruta), histograma in sorted(self.latencia_solicitudes.items()):
+            lineas.extend(_lineas_histograma("admtaller_http_duracion_segundos", histograma, metodo=metodo, ruta=ruta))
+
+        lineas.append("# HELP admtaller_db_consulta_duracion_segundos Duración de las sentencias SQL por handler")
+        lineas.append("# TYPE admtaller_db_consulta_duracion_segundos histogram")
+        for handler, histograma in sorted(self.latencia_consultas.items()):
+            lineas.extend(_lineas_histograma("admtaller_db_consulta_duracion_segundos", histograma, handler=handler))
+
+        for nombre, descripcion, valores in (("admtaller_db_filas_total", "Filas leídas o modificadas por las sentencias SQL por handler", self.filas_consultas),
+                                             ("admtaller_db_consultas_lentas_total", f"Sentencias SQL que superaron {UMBRAL_CONSULTA_LENTA}s por handler", self.consultas_lentas),
+                                             ("admtaller_db_consultas_error_total", "Sentencias SQL terminadas con error por handler", self.errores_consultas)):
+            lineas.append(f"# HELP {nombre} {descripcion}")
+            lineas.append(f"# TYPE {nombre} counter")
+            for handler, valor in sorted(valores.items()):
+                lineas.append(f"{nombre}{_etiquetas(handler=handler)} {valor}")
+
+        lineas.append("# HELP admtaller_db_pool_conexiones Conexiones del pool por estado")
+        lineas.append("# TYPE admtaller_db_pool_conexiones gauge")
+        lineas.append(f"admtaller_db_pool_conexiones{_etiquetas(estado='en_uso')} {estadisticas_pool['en_uso']}")
+        lineas.append(f"admtaller_db_pool_conexiones{_etiquetas(estado='libres')} {estadisticas_pool['freesize']}")
+        lineas.append("# HELP admtaller_db_pool_checkouts_total Conexiones entregadas por el pool")
+        lineas.append("# TYPE admtaller_db_pool_checkouts_total counter")
+        lineas.append(f"admtaller_db_pool_checkouts_total {estadisticas_pool['checkouts']}")
+        lineas.append("# HELP admtaller_db_pool_checkouts_fallidos_total Solicitudes de conexión al pool que no pudieron atenderse")
+        lineas.append("# TYPE admtaller_db_pool_checkouts_fallidos_total counter")
+        lineas.append(f"admtaller_db_pool_checkouts_fallidos_total {estadisticas_pool['checkouts_fallidos']}")
+
+        return "\n".join(lineas) + "\n"
+
+
+def _etiquetas(**etiquetas) -> str:
+    pares = []
+    for nombre, valor in etiquetas.items():
+        valor = str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pares.append(f'{nombre}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+
+def _lineas_histograma(nombre: str, histograma: Histograma, **etiquetas) -> list:
+    lineas = []
+    acumulado = 0
+    for limite, conteo in zip(INTERVALOS_LATENCIA, histograma.conteos):
+        acumulado += conteo
+        lineas.append(f"{nombre}_bucket{_etiquetas(**etiquetas, le=limite)} {acumulado}")
+    lineas.append(f"{nombre}_bucket{_etiquetas(**etiquetas, le='+Inf')} {histograma.cantidad}")
+    lineas.append(f"{nombre}_sum{_etiquetas(**etiquetas)} {histograma.suma}")
+    lineas.append(f"{nombre}_count{_etiquetas(**etiquetas)} {histograma.cantidad}")
+    return lineas
+
+
+metricas = Metricas()
+
+
+# Tiempos de la solicitud en curso. Las consultas ejecutadas en paralelo (asyncio.gather) comparten el mismo
+# contexto, por lo que el tiempo de base de datos puede superar al tiempo transcurrido
+class ContextoSolicitud:
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.inicio: float = time.perf_counter()
+        self.fin_endpoint: float = None
+        self.inicio_respuesta: float = None
+        self.tiempo_db: float = 0.0
+        self.consultas: int = 0
+
+    def handler(self) -> str:
+        endpoint = self.scope.get("endpoint")
+        if endpoint is None:
+            return "sin_handler"
+        return f"{endpoint.__module__.rsplit('.', 1)[-1]}.{endpoint.__name__}"
+
+    # Desglose en formato Server-Timing: base de datos, resto del handler, serialización de la respuesta y total.
+    # Si el endpoint no quedó instrumentado (sincrónico, o agregado después de instrumenta_rutas) no se conoce el
+    # término del handler: su tiempo incluye la serialización y ésta no se informa, en vez de informarla en cero
+    def server_timing(self) -> str:
+        ahora = self.inicio_respuesta or time.perf_counter()
+        fin_endpoint = self.fin_endpoint or ahora
+        db = self.tiempo_db * 1000
+        handler = max((fin_endpoint - self.inicio) * 1000 - db, 0.0)
+        total = (ahora - self.inicio) * 1000
+        entradas = [f'db;dur={db:.2f};desc="{self.consultas} consultas"', f"handler;dur={handler:.2f}"]
+        if self.fin_endpoint is not None:
+            entradas.append(f"serializacion;dur={(ahora - self.fin_endpoint) * 1000:.2f}")
+        entradas.append(f"total;dur={total:.2f}")
+        return ", ".join(entradas)
+
+
+_contexto_solicitud: ContextVar = ContextVar("contexto_solicitud", default=None)
+
+
+# Suma el tiempo a la solicitud en curso y retorna el handler al que se asigna
+def _acumula_tiempo_db(duracion: float, consultas: int) -> str:
+    contexto: ContextoSolicitud = _contexto_solicitud.get()
+    if contexto is None:
+        return K_SIN_HANDLER
+    contexto.tiempo_db += duracion
+    contexto.consultas += consultas
+    return contexto.handler()
+
+
+def _registra_consulta(query: str, duracion: float, filas: int, error: bool):
+    metricas.registra_consulta(_acumula_tiempo_db(duracion, 1), query, duracion, filas, error)
+
+
+# Cursores que miden cada sentencia SQL. El pool los usa por omisión (cursorclass) y executemany pasa por execute
+class CursorInstrumentado(aiomysql.Cursor):
+
+    async def execute(self, query, args=None):
+        inicio = time.perf_counter()
+        try:
+            resultado = await super().execute(query, args)
+        except Exception:
+            _registra_consulta(query, time.perf_counter() - inicio, 0, True)
+            raise
+        _registra_consulta(query, time.perf_counter() - inicio, max(self.rowcount, 0), False)
+        return resultado
+
+
+# En un cursor del lado del servidor las filas llegan al leerlas, por lo que también se mide fetchmany
+class SSCursorInstrumentado(aiomysql.SSCursor):
+
+    async def execute(self, query, args=None):
+        inicio = time.perf_counter()
+        try:
+            resultado = await super().execute(query, args)
+        except Exception:
+            _registra_consulta(query, time.perf_counter() - inicio, 0, True)
+            raise
+        _registra_consulta(query, time.perf_counter() - inicio, 0, False)
+        return resultado
+
+    async def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        filas = await super().fetchmany(size)
+        handler = _acumula_tiempo_db(time.perf_counter() - inicio, 0)
+        metricas.filas_consultas[handler] = metricas.filas_consultas.get(handler, 0) + len(filas)
+        return filas
+
+
+# Middleware ASGI que mide la latencia de cada solicitud hasta el último byte de la respuesta (incluye respuestas en
+# streaming) y, si la solicitud trae el encabezado X-Perfilado, agrega el desglose en el encabezado Server-Timing
+class MiddlewareMetricas:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        contexto = ContextoSolicitud(scope)
+        perfilar = any(nombre == ENCABEZADO_PERFILADO for nombre, valor in scope.get("headers", []))
+        estado = 500
+
+        async def send_instrumentado(message):
+            nonlocal estado
+            if message["type"] == "http.response.start":
+                estado = message["status"]
+                contexto.inicio_respuesta = time.perf_counter()
+                if perfilar:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", contexto.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        token = _contexto_solicitud.set(contexto)
+        try:
+            await self.app(scope, receive, send_instrumentado)
+        finally:
+            _contexto_solicitud.reset(token)
+            # Se usa la plantilla de la ruta y no la URL, para no crear una serie por cada valor de los parámetros
+            ruta = scope.get("route")
+            metricas.registra_solicitud(scope["method"], ruta.path if ruta is not None else "sin_ruta", estado, time.perf_counter() - contexto.inicio)
+
+
+def _instrumenta_endpoint(endpoint):
+    @functools.wraps(endpoint)
+    async def endpoint_instrumentado(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            contexto: ContextoSolicitud = _contexto_solicitud.get()
+            if contexto is not None:
+                contexto.fin_endpoint = time.perf_counter()
+    return endpoint_instrumentado
+
+
+# Marca el término de cada endpoint para separar el tiempo del handler del de serialización de la respuesta.
+# Se aplica sobre las rutas ya incluidas en la aplicación; FastAPI llama a dependant.call en cada solicitud
+def instrumenta_rutas(app):
+    for ruta in app.routes:
+        dependant = getattr(ruta, "dependant", None)
+        # Sólo endpoints async: FastAPI ejecuta los sincrónicos en un threadpool según el tipo de dependant.call
+        if dependant is None or not asyncio.iscoroutinefunction(dependant.call):
+            continue
+        dependant.call = _instrumenta_endpoint(dependant.call)
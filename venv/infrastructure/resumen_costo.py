@@ -0,0 +1,146 @@
+import asyncio
+import sys
+
+import aiomysql
+
+
+# Resumen materializado del costo de cada taller: suma de round(precio * cantidad) de sus productos.
+# Sólo existen filas para talleres con productos configurados, igual que el join con config_taller
+# que reemplaza en las consultas
+DDL_RESUMEN_COSTO_TALLER = " \
+    create table if not exists resumen_costo_taller ( \
+        id_taller int not null, \
+        total_taller decimal(14, 0) not null, \
+        fecha_actualizacion timestamp not null default current_timestamp on update current_timestamp, \
+        primary key (id_taller) \
+    )"
+
+# Resumen por asignatura construido sobre el resumen por taller
+DDL_RESUMEN_COSTO_ASIGN = " \
+    create or replace view resumen_costo_asign as \
+    select t.sigla as sigla, \
+        sum(r.total_taller) as total_asign \
+    from resumen_costo_taller r \
+    join taller t on r.id_taller = t.id_taller \
+    group by t.sigla"
+
+# Agregación en línea contra la que se construye y verifica el resumen
+QUERY_COSTO_TALLER = " \
+    select ct.id_taller as id_taller, \
+        sum(round(p.precio * ct.cantidad, 0)) as total_taller \
+    from config_taller ct \
+    join producto p on ct.id_producto = p.id_producto"
+
+
+# Crea las estructuras del resumen si no existen y lo construye la primera vez
+async def asegura_resumen_costo(db: aiomysql.Connection):
+    async with db.cursor() as cursor:
+        await cursor.execute(DDL_RESUMEN_COSTO_TALLER)
+        await cursor.execute(DDL_RESUMEN_COSTO_ASIGN)
+        await cursor.execute("select count(*) from resumen_costo_taller")
+        result = await cursor.fetchone()
+
+    if result[0] == 0:
+        await reconstruye_resumen_costo(db)
+
+
+# Reconstruye completamente el resumen desde config_taller y producto
+async def reconstruye_resumen_costo(db: aiomysql.Connection) -> int:
+    await db.begin()
+    try:
+        async with db.cursor() as cursor:
+            await cursor.execute("delete from resumen_costo_taller")
+            await cursor.execute(f"insert into resumen_costo_taller (id_taller, total_taller) {QUERY_COSTO_TALLER} group by ct.id_taller")
+            filas = cursor.rowcount
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return filas
+
+
+# Recalcula el resumen de los talleres indicados. Se usa después de modificar config_taller o taller, dentro de la
+# misma transacción de la modificación para que ambos se confirmen o deshagan juntos
+async def actualiza_costo_talleres(db: aiomysql.Connection, id_talleres: list):
+    if not id_talleres:
+        return
+
+    marcadores = ", ".join(["%s"] * len(id_talleres))
+    values = tuple(id_talleres)
+
+    async with db.cursor() as cursor:
+        await cursor.execute(f"insert into resumen_costo_taller (id_taller, total_taller) {QUERY_COSTO_TALLER} where ct.id_taller in ({marcadores}) group by ct.id_taller \
+            on duplicate key update total_taller = values(total_taller)", values)
+        await cursor.execute(f"delete from resumen_costo_taller where id_taller in ({marcadores}) and \
+            not exists (select 1 from config_taller ct where ct.id_taller = resumen_costo_taller.id_taller)", values)
+
+
+# Recalcula el resumen de todos los talleres que usan un producto, por ejemplo tras un cambio de precio
+async def actualiza_costo_producto(db: aiomysql.Connection, id_producto: int):
+    query = "select distinct ct.id_taller from config_taller ct where ct.id_producto = %s"
+    async with db.cursor() as cursor:
+        await cursor.execute(query, (id_producto,))
+        result = await cursor.fetchall()
+
+    await actualiza_costo_talleres(db, [row[0] for row in result])
+
+
+# Compara el resumen con la agregación en línea y retorna los talleres que difieren
+async def verifica_resumen_costo(db: aiomysql.Connection) -> list:
+    async with db.cursor() as cursor:
+        await cursor.execute(f"{QUERY_COSTO_TALLER} group by ct.id_taller")
+        en_linea = {row[0]: row[1] for row in await cursor.fetchall()}
+        await cursor.execute("select r.id_taller, r.total_taller from resumen_costo_taller r")
+        resumen = {row[0]: row[1] for row in await cursor.fetchall()}
+
+    diferencias = []
+    for id_taller in sorted(set(en_linea) | set(resumen)):
+        if en_linea.get(id_taller) != resumen.get(id_taller):
+            diferencias.append({
+                "id_taller": id_taller,
+                "total_en_linea": en_linea.get(id_taller),
+                "total_resumen": resumen.get(id_taller),
+            })
+
+    return diferencias
+
+
+# Uso: python -m infrastructure.resumen_costo [reconstruir | verificar]
+async def main(comando: str) -> int:
+    from database import get_db_connection
+    from database import release_db_connection
+    from database import close_pool
+
+    db = await get_db_connection()
+    if db is None:
+        print("Error al conectar a la base de datos")
+        return 1
+
+    try:
+        async with db.cursor() as cursor:
+            await cursor.execute(DDL_RESUMEN_COSTO_TALLER)
+            await cursor.execute(DDL_RESUMEN_COSTO_ASIGN)
+
+        if comando == "reconstruir":
+            filas = await reconstruye_resumen_costo(db)
+            print(f"Resumen de costos reconstruido: {filas} talleres")
+            return 0
+
+        if comando == "verificar":
+            diferencias = await verifica_resumen_costo(db)
+            for diferencia in diferencias:
+                print(f"Taller {diferencia['id_taller']}: en línea {diferencia['total_en_linea']}, resumen {diferencia['total_resumen']}")
+            print(f"Talleres con diferencias: {len(diferencias)}")
+            return 0 if not diferencias else 2
+
+        print("Uso: python -m infrastructure.resumen_costo [reconstruir | verificar]")
+        return 1
+
+    finally:
+        release_db_connection(db)
+        await close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "")))
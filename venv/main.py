@@ -0,0 +1,142 @@
+
+import fastapi
+
+# Importación de routers
+from api import autenticacion
+from api import usuario
+from api import perfil
+from api import principal
+from api import asignatura
+from api import programacion
+from api import producto
+from api import registro
+from api import taller
+from api import carrera
+from api import param
+from api import agrupador
+from api import unidad_medida
+from api import categoria_producto
+from api import consultas
+from api import diagnostico
+
+from database import create_pool
+from database import close_pool
+from database import get_db_connection
+from database import release_db_connection
+from infrastructure.resumen_costo import asegura_resumen_costo
+from infrastructure.idempotencia import asegura_idempotencia
+from infrastructure.idempotencia import purga_idempotencia
+from infrastructure.dashboard import snapshot_dashboard
+from infrastructure.metricas import MiddlewareMetricas
+from infrastructure.metricas import instrumenta_rutas
+
+# Instanciamos la aplicación
+api = fastapi.FastAPI(
+    title="API's para sistema de administración de talleres DuocUC",
+    description="Catálogo de API's construidas para dar servicio al sistema web de administración de talleres DuocUC para las carreras de gastronomía y administración hotelera",
+    openapi_tags=[
+        {"name": "Asignaturas",
+         "description": "API's relacionadas con asignaturas"},
+        {"name": "Agrupadores",
+         "description": "API's relacionadas con los agrupadores de los productos de un taller"},
+        {"name": "Autenticación",
+         "description": "API's relacionadas con la autenticación de usuario, cambio de contraseña y otras"},
+        {"name": "Carreras",
+         "description": "API's relacionadas con la administración de carreras"},
+        {"name": "Categorías de productos",
+         "description": "API's relacionadas con las categorías de los productos"},
+        {"name": "Consultas",
+         "description": "API's relacionadas con consultas del sistema"},
+        {"name": "Diagnóstico",
+         "description": "API's relacionadas con el estado y rendimiento de la aplicación"},
+        {"name": "Parámetros",
+         "description": "API's relacionadas con los parámetros del sistema"},
+        {"name": "Perfiles",
+         "description": "API's relacionadas con los perfiles del sistema o asociadas al perfilamiento del usuario"},
+        {"name": "Principal",
+         "description": "API's relacionadas con el dashboard que se muestra en la página principal de un usuario ya autenticado"},
+        {"name": "Productos",
+         "description": "API's relacionadas con los productos del sistema"},
+        {"name": "Programación",
+         "description": "API's relacionadas con la programación de los talleres"},
+        {"name": "Registro",
+         "description": "API's relacionadas con el registro de ejecución de los talleres"},
+        {"name": "Talleres",
+         "description": "API's relacionadas con la administración de los talleres"},
+        {"name": "Unidades de medida",
+         "description": "API's relacionadas con las unidades de medida disponibles en el sistema"},
+        {"name": "Usuarios",
+         "description": "API's relacionadas con la administración de usuarios"},
+    ],
+    version="0.1.0",
+)
+
+# Latencia por ruta, tiempos de SQL por handler y perfilado opcional por solicitud (ver /metrics)
+api.add_middleware(MiddlewareMetricas)
+
+
+# Método de configuración de routers
+async def configura_routers():
+    api.include_router(autenticacion.router)
+    api.include_router(usuario.router)
+    api.include_router(perfil.router)
+    api.include_router(principal.router)
+    api.include_router(asignatura.router)
+    api.include_router(programacion.router)
+    api.include_router(producto.router)
+    api.include_router(registro.router)
+    api.include_router(taller.router)
+    api.include_router(carrera.router)
+    api.include_router(param.router)
+    api.include_router(agrupador.router)
+    api.include_router(unidad_medida.router)
+    api.include_router(categoria_producto.router)
+    api.include_router(consultas.router)
+    api.include_router(diagnostico.router)
+
+
+# Método de configuración de base de datos
+async def configura_db():
+    # Crea el pool de conexiones compartido; los routers toman y devuelven conexiones a través de database.get_db
+    pool = await create_pool()
+    if pool is None:
+        print("Error al conectar a la base de datos: no se pudo crear el pool de conexiones")
+        return
+
+    # Asegura que exista el resumen de costos por taller que usan las consultas
+    db = await get_db_connection()
+    try:
+        await asegura_resumen_costo(db)
+    except Exception as e:
+        print(f"Error al preparar el resumen de costos: {e}")
+
+    # Asegura que exista la tabla de claves de idempotencia del registro de talleres
+    try:
+        await asegura_idempotencia(db)
+    except Exception as e:
+        print(f"Error al preparar las claves de idempotencia: {e}")
+    finally:
+        release_db_connection(db)
+
+
+# Método de configuración general, que llama a los otros sub-métodos de configuración
+async def configura():
+    await configura_db()
+    await configura_routers()
+    instrumenta_rutas(api)
+    # Refresco en segundo plano del snapshot de contadores que muestra la página principal
+    snapshot_dashboard.inicia()
+    # Purga periódica de las claves de idempotencia vencidas
+    purga_idempotencia.inicia()
+
+
+# Método para cerrar las conexiones a la base de datos
+async def close_db_connection():
+    await snapshot_dashboard.detiene()
+    await purga_idempotencia.detiene()
+    await close_pool()
+
+
+# Manejadores de eventos
+api.add_event_handler("startup", configura)
+api.add_event_handler("shutdown", close_db_connection)
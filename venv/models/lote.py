@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List
+from typing import Optional
+
+
+# Modelo que representa el resultado de un elemento dentro de una inserción por lote
+class ResultadoLote(BaseModel):
+
+    indice: int
+    estado: int
+    msg_error: Optional[str]
+
+
+# Modelo que representa el resultado de una inserción por lote
+class RespuestaLote(BaseModel):
+
+    confirmado: bool
+    insertados: int
+    con_error: int
+    msg_error: Optional[str]
+    resultados: List[ResultadoLote]
@@ -0,0 +1,27 @@
+
+from pydantic import BaseModel
+from typing import List
+from typing import Optional
+
+
+# Modelo que representa un producto en un taller específico
+class ProductoTaller(BaseModel):
+
+    id_producto: int
+    id_taller: int
+    cod_agrupador: int
+    cantidad: float
+    nom_unidad_medida: Optional[str]
+    nom_producto: Optional[str]
+    cod_categ_producto: Optional[int]
+    nom_categ_producto: Optional[str]
+    nom_agrupador: Optional[str]
+    precio: Optional[int]
+    total: Optional[int]
+
+
+# Modelo que representa un lote de productos de talleres a insertar en una sola transacción
+class LoteProductoTaller(BaseModel):
+
+    todo_o_nada: bool = False
+    productos: List[ProductoTaller]
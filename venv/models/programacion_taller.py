@@ -0,0 +1,45 @@
+
+from pydantic import BaseModel
+from typing import List
+from typing import Optional
+
+
+# Modelo que representa la programación de un taller específico
+class ProgramacionTaller(BaseModel):
+
+    fecha: str
+    ano_academ: int
+    cod_periodo_academ: int
+    sigla: str
+    seccion: int
+    id_taller: int
+    id_usuario: Optional[int]
+    nom_periodo_academ: Optional[str]
+    nom_asignatura: Optional[str]
+    titulo_preparacion: Optional[str]
+    semana: Optional[int]
+    login: Optional[str]
+    nom_preferido: Optional[str]
+    primer_apellido: Optional[str]
+    segundo_apellido: Optional[str]
+
+
+# Modelo que representa un lote de programaciones de talleres a insertar en una sola transacción
+class LoteProgramacionTaller(BaseModel):
+
+    todo_o_nada: bool = False
+    programaciones: List[ProgramacionTaller]
+
+
+# Modelo que representa la copia de la programación de talleres de una sección a otra
+class CopiaProgramacionTaller(BaseModel):
+
+    sigla: str
+    ano_academ_origen: int
+    cod_periodo_academ_origen: int
+    seccion_origen: int
+    ano_academ_destino: int
+    cod_periodo_academ_destino: int
+    seccion_destino: int
+    dias_desplazamiento: Optional[int]
+    todo_o_nada: bool = False